@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Facility, TimeSlot, Booking, FacilityPricing, GalleryImage, FacilityClosure
+from django.db import transaction
+from .models import Facility, TimeSlot, Booking, BookingArchive, FacilityPricing, GalleryImage, FacilityClosure, SlotOccupancy
+from .reservations import resync_occupancy
 
 class FacilityPricingInline(admin.TabularInline):
     model = FacilityPricing
@@ -19,6 +21,27 @@ class BookingAdmin(admin.ModelAdmin):
     list_display = ('user', 'facility', 'slot', 'booking_date', 'status')
     list_filter = ('status', 'booking_date', 'facility')
 
+    def save_model(self, request, obj, form, change):
+        # Edits here bypass the reservation engine, so recount the affected slots
+        keys = {(obj.facility_id, obj.slot_id, obj.booking_date)}
+        if change:
+            original = Booking.objects.get(pk=obj.pk)
+            keys.add((original.facility_id, original.slot_id, original.booking_date))
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            for key in keys:
+                resync_occupancy(*key)
+
+@admin.register(BookingArchive)
+class BookingArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'facility', 'slot', 'booking_date', 'status', 'archived_at')
+    list_filter = ('status', 'facility')
+
 @admin.register(GalleryImage)
 class GalleryImageAdmin(admin.ModelAdmin):
     list_display = ('title', 'uploaded_at')
+
+@admin.register(SlotOccupancy)
+class SlotOccupancyAdmin(admin.ModelAdmin):
+    list_display = ('facility', 'slot', 'booking_date', 'active_count')
+    list_filter = ('facility', 'booking_date')
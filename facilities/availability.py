@@ -0,0 +1,74 @@
+"""
+Cached slot availability per facility and date window.
+
+Entries live in the 'availability' cache namespace, scoped per facility.
+Any booking, closure or facility change bumps that facility's version (or
+the whole namespace, for closures that apply to every facility), so stale
+windows simply stop being looked up and age out of the cache on their own.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db.models import Q
+
+from sports_management_system.caching import Namespace
+
+from .models import FacilityClosure, SlotOccupancy
+
+DEFAULT_WINDOW_DAYS = 90
+MAX_WINDOW_DAYS = 366
+CACHE_TIMEOUT = 60 * 60
+
+AVAILABILITY = Namespace('availability', timeout=CACHE_TIMEOUT)
+
+
+def invalidate(facility_id=None):
+    """Drop cached availability for one facility, or for all of them."""
+    AVAILABILITY.invalidate(scope=facility_id or None)
+
+
+def default_window(today):
+    return today, today + timedelta(days=DEFAULT_WINDOW_DAYS)
+
+
+def get_availability(facility, date_from, date_to):
+    """
+    Return (payload, body, etag) for the facility between the two dates
+    (inclusive). body is the serialised payload and etag a strong validator
+    derived from it.
+    """
+    key = f'{date_from.isoformat()}:{date_to.isoformat()}'
+    return AVAILABILITY.get_or_set(
+        key, lambda: _build(facility, date_from, date_to), scope=facility.id
+    )
+
+
+def _build(facility, date_from, date_to):
+    closures = FacilityClosure.objects.filter(
+        date__gte=date_from,
+        date__lte=date_to
+    ).filter(Q(facility=facility) | Q(facility__isnull=True)).values_list('date', 'description')
+
+    occupancy = SlotOccupancy.objects.filter(
+        facility=facility,
+        booking_date__gte=date_from,
+        booking_date__lte=date_to,
+        active_count__gt=0
+    ).values_list('booking_date', 'slot_id', 'active_count')
+
+    slots = {}
+    for b_date, s_id, count in occupancy:
+        slots.setdefault(b_date.strftime('%Y-%m-%d'), {})[str(s_id)] = count
+
+    payload = {
+        'facility': facility.id,
+        'capacity': facility.capacity_per_slot,
+        'from': date_from.strftime('%Y-%m-%d'),
+        'to': date_to.strftime('%Y-%m-%d'),
+        'closures': [{'date': c[0].strftime('%Y-%m-%d'), 'desc': c[1]} for c in closures],
+        'slots': slots,
+    }
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    etag = '"%s"' % hashlib.sha1(body.encode()).hexdigest()
+    return payload, body, etag
@@ -0,0 +1,132 @@
+"""
+Booking rules engine.
+
+load_context() fetches everything the rules need about the user, facility
+and date in two queries. The rules themselves are pure functions over the
+resulting BookingContext, so they can be exercised without a database.
+Each rule returns an error message, or None if the booking is allowed.
+"""
+from datetime import datetime
+
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Booking, Facility, FacilityClosure, SlotOccupancy
+
+
+class BookingContext:
+    """Snapshot of the state a booking request is validated against."""
+
+    def __init__(self, user, facility, slot, booking_date, today, now,
+                 closure_description=None, occupied=0, user_bookings=()):
+        self.user = user
+        self.facility = facility
+        self.slot = slot
+        self.booking_date = booking_date
+        self.today = today
+        self.now = now  # Naive local datetime, comparable with slot times
+        self.closure_description = closure_description
+        self.occupied = occupied
+        # (booking_date, facility_id, slot_id, session) of the user's active bookings from today on
+        self.user_bookings = list(user_bookings)
+
+
+def load_context(user, facility, slot, booking_date, today, now):
+    """Build a BookingContext with one query for the facility and one for the user."""
+    closure = FacilityClosure.objects.filter(
+        date=booking_date
+    ).filter(Q(facility=OuterRef('pk')) | Q(facility__isnull=True)).values('description')[:1]
+
+    occupancy = SlotOccupancy.objects.filter(
+        facility=OuterRef('pk'),
+        slot=slot,
+        booking_date=booking_date
+    ).values('active_count')[:1]
+
+    closure_description, occupied = Facility.objects.filter(pk=facility.pk).annotate(
+        closure_description=Subquery(closure),
+        occupied=Coalesce(Subquery(occupancy), Value(0)),
+    ).values_list('closure_description', 'occupied').get()
+
+    user_bookings = Booking.objects.filter(
+        user=user,
+        booking_date__gte=today,
+        status='active'
+    ).values_list('booking_date', 'facility_id', 'slot_id', 'slot__session')
+
+    return BookingContext(
+        user, facility, slot, booking_date, today, now,
+        closure_description=closure_description,
+        occupied=occupied,
+        user_bookings=user_bookings,
+    )
+
+
+def check_user_approved(ctx):
+    if ctx.user.status != 'approved':
+        return "User is not approved to make bookings."
+
+
+def check_not_past(ctx):
+    if ctx.booking_date < ctx.today:
+        return "Cannot book past dates."
+
+
+def check_closure(ctx):
+    if ctx.closure_description is not None:
+        return f"Facility closed on {ctx.booking_date}: {ctx.closure_description}"
+
+
+def check_future_day_limit(ctx):
+    """Max 1 distinct future date allowed."""
+    if ctx.booking_date <= ctx.today:
+        return None
+    future_days = {b[0] for b in ctx.user_bookings if b[0] > ctx.today}
+    if future_days and ctx.booking_date not in future_days:
+        return f"You can only have bookings for ONE future day at a time. You already have bookings for {sorted(future_days)[0]}."
+
+
+def check_one_per_session(ctx):
+    """Max 1 booking per shift/session per day (also covers double-booking the same slot)."""
+    for b_date, _, _, session in ctx.user_bookings:
+        if b_date == ctx.booking_date and session == ctx.slot.session:
+            return f"You can only make ONE booking per shift ({ctx.slot.session}) per day."
+
+
+def check_game_diversity(ctx):
+    """Cannot play the same game in two shifts, unless the slot starts within the hour."""
+    same_game = any(
+        b_date == ctx.booking_date and facility_id == ctx.facility.id and session != ctx.slot.session
+        for b_date, facility_id, _, session in ctx.user_bookings
+    )
+    if not same_game:
+        return None
+    time_diff = datetime.combine(ctx.booking_date, ctx.slot.start_time) - ctx.now
+    if time_diff.total_seconds() > 3600:
+        return f"You cannot book {ctx.facility.facility_name} in multiple shifts on the same day, unless it is less than 1 hour before the slot starts."
+
+
+def check_capacity(ctx):
+    """Early rejection only; reserve_slot() is what actually enforces capacity."""
+    if ctx.occupied >= ctx.facility.capacity_per_slot:
+        return f"Slot is full! (Capacity: {ctx.facility.capacity_per_slot})"
+
+
+RULES = [
+    check_user_approved,
+    check_not_past,
+    check_closure,
+    check_future_day_limit,
+    check_one_per_session,
+    check_game_diversity,
+    check_capacity,
+]
+
+
+def evaluate(ctx, rules=RULES):
+    """Return the first rule violation for the context, or None."""
+    for rule in rules:
+        error = rule(ctx)
+        if error:
+            return error
+    return None
@@ -0,0 +1,75 @@
+"""
+In-process facility catalogue.
+
+Facilities change rarely, so each worker loads them once (with image URLs
+resolved) and keeps them in memory. The catalogue is tied to the version of
+the 'facility_catalogue' cache namespace; saving or deleting a Facility bumps
+it and every worker reloads on its next access. As a backstop for cache backends that are not shared
+between workers (where another worker's bump is never seen), a loaded
+catalogue is also dropped after MAX_AGE seconds. Anything that must be exact
+(capacity checks) reads the database, not the catalogue. When namespaces
+can't be invalidated across workers at all (CATALOGUE.enabled is False) the
+catalogue is loaded per call.
+
+The Facility instances are shared between requests: treat them as read-only.
+"""
+import threading
+import time
+
+from django.http import Http404
+
+from sports_management_system.caching import Namespace
+
+from .models import Facility
+
+CATALOGUE = Namespace('facility_catalogue')
+
+# Seconds a loaded catalogue is trusted without seeing a version bump
+MAX_AGE = 60
+
+_lock = threading.Lock()
+# (namespace key, expiry, {id: Facility}) swapped as one tuple
+_loaded = (None, 0, {})
+
+
+def _load():
+    facilities = {}
+    for facility in Facility.objects.order_by('id'):
+        facility.image_url = facility.image.url if facility.image else ''
+        facilities[facility.id] = facility
+    return facilities
+
+
+def _catalogue():
+    global _loaded
+    if not CATALOGUE.enabled:
+        return _load()
+    version = CATALOGUE.key('all')
+    if _loaded[0] != version or _loaded[1] < time.monotonic():
+        with _lock:
+            if _loaded[0] != version or _loaded[1] < time.monotonic():
+                _loaded = (version, time.monotonic() + MAX_AGE, _load())
+    return _loaded[2]
+
+
+def all_facilities():
+    return list(_catalogue().values())
+
+
+def active_facilities():
+    return [facility for facility in _catalogue().values() if facility.is_active]
+
+
+def get_facility(facility_id):
+    return _catalogue().get(facility_id)
+
+
+def get_facility_or_404(facility_id):
+    facility = get_facility(facility_id)
+    if facility is None:
+        raise Http404('No Facility matches the given query.')
+    return facility
+
+
+def invalidate():
+    CATALOGUE.invalidate()
@@ -0,0 +1,65 @@
+"""
+Booking history exports (CSV and iCalendar).
+
+Both formats are produced line by line from facilities.history.user_history(),
+which streams from the database, so StreamingHttpResponse can send years of
+history without holding it in memory.
+"""
+import csv
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+CSV_HEADER = ['Reference', 'Facility', 'Date', 'Start', 'End', 'Session', 'Status', 'Booked at']
+
+ICAL_STATUS = {'pending': 'TENTATIVE', 'cancelled': 'CANCELLED'}
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each row back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(bookings):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for booking in bookings:
+        yield writer.writerow([
+            booking.id,
+            booking.facility.facility_name,
+            booking.booking_date.isoformat(),
+            booking.slot.start_time.strftime('%H:%M'),
+            booking.slot.end_time.strftime('%H:%M'),
+            booking.session,
+            booking.status,
+            timezone.localtime(booking.created_at).strftime('%Y-%m-%d %H:%M'),
+        ])
+
+
+def _ical_time(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ical_text(value):
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def ical_lines(bookings, host):
+    yield 'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//GovSports//Bookings//EN\r\nCALSCALE:GREGORIAN\r\n'
+    for booking in bookings:
+        start = timezone.make_aware(datetime.combine(booking.booking_date, booking.slot.start_time))
+        end = timezone.make_aware(datetime.combine(booking.booking_date, booking.slot.end_time))
+        yield (
+            'BEGIN:VEVENT\r\n'
+            f'UID:booking-{booking.id}@{host}\r\n'
+            f'DTSTAMP:{_ical_time(booking.created_at)}\r\n'
+            f'DTSTART:{_ical_time(start)}\r\n'
+            f'DTEND:{_ical_time(end)}\r\n'
+            f'SUMMARY:{_ical_text(booking.facility.facility_name)}\r\n'
+            f'DESCRIPTION:Booking #{booking.id} ({booking.session} session)\r\n'
+            f'STATUS:{ICAL_STATUS.get(booking.status, "CONFIRMED")}\r\n'
+            'END:VEVENT\r\n'
+        )
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,129 @@
+"""
+Booking history across the live and archive tables.
+
+Completed and cancelled bookings older than ARCHIVE_AFTER_DAYS are moved
+from Booking to BookingArchive in batches, so the rule, capacity and
+calendar queries only ever see recent and upcoming rows. Anything that
+shows a user's full history reads both tables through this module.
+"""
+import heapq
+from datetime import timedelta
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Booking, BookingArchive
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVED_STATUSES = ('completed', 'cancelled')
+# Copied column for column, so each batch is one INSERT ... SELECT
+COPIED_FIELDS = ('id', 'user', 'facility', 'slot', 'booking_date', 'session', 'status', 'created_at')
+
+
+def archivable(cutoff):
+    """Bookings that may be archived: finished, and dated before cutoff."""
+    return Booking.objects.filter(status__in=ARCHIVED_STATUSES, booking_date__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move up to batch_size archivable bookings in one transaction, with
+    set-based statements rather than per-row ORM work (no post_delete
+    handlers are needed: finished bookings hold no seats).
+    Returns the number of bookings in the batch (0 when nothing is left).
+    """
+    from payments.models import Payment
+
+    quote = connection.ops.quote_name
+    with transaction.atomic():
+        ids = list(archivable(cutoff).order_by('pk').select_for_update().values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        batch = archivable(cutoff).filter(pk__gte=ids[0], pk__lte=ids[-1])
+        archived = BookingArchive.objects.filter(pk__gte=ids[0], pk__lte=ids[-1])
+
+        columns = ', '.join(quote(BookingArchive._meta.get_field(name).column) for name in COPIED_FIELDS)
+        select_sql, select_params = batch.values_list(*COPIED_FIELDS).query.sql_with_params()
+        archived_sql, archived_params = archived.values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(BookingArchive._meta.db_table)} ({columns}) {select_sql}", select_params
+            )
+            Payment.objects.filter(booking_id__in=archived.values('pk')).update(
+                archived_booking_id=F('booking_id'), booking=None
+            )
+            cursor.execute(
+                f"DELETE FROM {quote(Booking._meta.db_table)} WHERE {quote(Booking._meta.pk.column)} IN ({archived_sql})", archived_params
+            )
+    return len(ids)
+
+
+def archive_bookings(days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive everything finished more than `days` days ago. Returns the number moved."""
+    cutoff = timezone.localdate() - timedelta(days=days)
+    moved = 0
+    while True:
+        count = archive_batch(cutoff, batch_size)
+        moved += count
+        if count < batch_size:
+            return moved
+
+
+def _after(bookings, after, descending):
+    """Keyset filter: rows strictly after (booking_date, id) in the given direction."""
+    if after is None:
+        return bookings
+    booking_date, booking_id = after
+    if descending:
+        return bookings.filter(Q(booking_date__lt=booking_date) | Q(booking_date=booking_date, id__lt=booking_id))
+    return bookings.filter(Q(booking_date__gt=booking_date) | Q(booking_date=booking_date, id__gt=booking_id))
+
+
+def _page(rows, limit):
+    """(first `limit` rows, (booking_date, id) to continue after or None) from up to limit + 1 rows."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], (last.booking_date, last.id)
+
+
+def upcoming_bookings(user, today, after=None, limit=20):
+    """
+    One page of the user's bookings from today on, soonest first. Only the
+    live table can hold these.
+    """
+    bookings = Booking.objects.filter(user=user, booking_date__gte=today)
+    bookings = _after(bookings, after, descending=False).select_related('facility', 'slot').order_by('booking_date', 'id')
+    return _page(bookings[:limit + 1], limit)
+
+
+def past_bookings(user, today, after=None, limit=20):
+    """One page of the user's bookings before today from both tables, newest first."""
+    tables = []
+    for model in (Booking, BookingArchive):
+        rows = _after(model.objects.filter(user=user, booking_date__lt=today), after, descending=True)
+        tables.append(rows.select_related('facility', 'slot').order_by('-booking_date', '-id')[:limit + 1])
+    merged = heapq.merge(*tables, key=lambda booking: (booking.booking_date, booking.id), reverse=True)
+    return _page(islice(merged, limit + 1), limit)
+
+
+def user_history(user):
+    """
+    Every booking of the user from both tables, newest first, with facility
+    and slot loaded. Streams from the database (.iterator()), so memory use
+    doesn't grow with the history. Archived rows are BookingArchive
+    instances, which have the same fields as Booking.
+    """
+    tables = [
+        model.objects.filter(user=user).select_related('facility', 'slot').order_by('-booking_date', '-id').iterator()
+        for model in (Booking, BookingArchive)
+    ]
+    return heapq.merge(*tables, key=lambda booking: (booking.booking_date, booking.id), reverse=True)
+
+
+def user_history_count(user):
+    return Booking.objects.filter(user=user).count() + BookingArchive.objects.filter(user=user).count()
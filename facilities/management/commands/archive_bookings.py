@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from facilities import history
+
+
+class Command(BaseCommand):
+    help = 'Move completed and cancelled bookings older than N days into the booking archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=history.ARCHIVE_AFTER_DAYS,
+                            help=f'Archive bookings dated more than this many days ago (default: {history.ARCHIVE_AFTER_DAYS})')
+        parser.add_argument('--batch-size', type=int, default=history.ARCHIVE_BATCH_SIZE,
+                            help=f'Bookings moved per transaction (default: {history.ARCHIVE_BATCH_SIZE})')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the bookings that would be archived')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            cutoff = timezone.localdate() - timedelta(days=options['days'])
+            count = history.archivable(cutoff).count()
+            self.stdout.write(f"Would archive {count} bookings dated before {cutoff}.")
+            return
+        moved = history.archive_bookings(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} bookings."))
@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from facilities.catalogue import invalidate
+from sports_management_system import images
+
+# (model, image field, manifest field)
+TARGETS = [
+    ('facilities.Facility', 'image', 'image_variants'),
+    ('facilities.GalleryImage', 'image', 'image_variants'),
+    ('users.User', 'photo', 'photo_variants'),
+]
+
+
+def _process(label, pk, field_name, manifest_field, force):
+    """Runs in a worker process."""
+    instance = apps.get_model(label).objects.get(pk=pk)
+    try:
+        return images.process(instance, field_name, manifest_field, force=force)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Generate resized WebP/AVIF variants for existing facility, gallery and user images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes (default: one per CPU)')
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that are already up to date')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for label, field_name, manifest_field in TARGETS:
+            rows = apps.get_model(label).objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for pk, name, manifest in rows.values_list('pk', field_name, manifest_field):
+                if options['force'] or (manifest or {}).get('source') != name:
+                    jobs.append((label, pk, field_name, manifest_field, options['force']))
+
+        if not jobs:
+            self.stdout.write(self.style.SUCCESS('All image variants are up to date.'))
+            return
+
+        # Workers open their own connections; don't hand them ours
+        connections.close_all()
+        processed = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            futures = {pool.submit(_process, *job): job for job in jobs}
+            for future in as_completed(futures):
+                label, pk = futures[future][:2]
+                try:
+                    future.result()
+                    processed += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{label} {pk}: {exc}')
+
+        invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated variants for {processed} images ({failed} failed).'
+        ))
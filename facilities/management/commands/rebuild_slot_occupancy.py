@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from facilities.models import Booking, SlotOccupancy
+from facilities.availability import invalidate
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SlotOccupancy counters from active bookings (or just verify them with --verify)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Only report mismatches, do not write')
+
+    def handle(self, *args, **options):
+        expected = {
+            (row['facility_id'], row['slot_id'], row['booking_date']): row['total']
+            for row in Booking.objects.filter(status='active')
+            .values('facility_id', 'slot_id', 'booking_date')
+            .annotate(total=Count('id'))
+        }
+        stored = {
+            (row.facility_id, row.slot_id, row.booking_date): row
+            for row in SlotOccupancy.objects.all()
+        }
+
+        missing = [key for key in expected if key not in stored]
+        wrong = [
+            row for key, row in stored.items()
+            if row.active_count != expected.get(key, 0)
+        ]
+
+        for key in missing:
+            self.stdout.write(f"Missing counter for facility={key[0]} slot={key[1]} date={key[2]}: expected {expected[key]}")
+        for row in wrong:
+            key = (row.facility_id, row.slot_id, row.booking_date)
+            self.stdout.write(f"Counter for facility={key[0]} slot={key[1]} date={key[2]} is {row.active_count}, expected {expected.get(key, 0)}")
+
+        if options['verify']:
+            if missing or wrong:
+                raise CommandError(f"{len(missing) + len(wrong)} slot occupancy counters out of sync.")
+            self.stdout.write(self.style.SUCCESS(f"All {len(stored)} slot occupancy counters match active bookings."))
+            return
+
+        with transaction.atomic():
+            SlotOccupancy.objects.bulk_create([
+                SlotOccupancy(facility_id=key[0], slot_id=key[1], booking_date=key[2], active_count=expected[key])
+                for key in missing
+            ])
+            for row in wrong:
+                row.active_count = expected.get((row.facility_id, row.slot_id, row.booking_date), 0)
+            SlotOccupancy.objects.bulk_update(wrong, ['active_count'])
+        invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(missing)} and corrected {len(wrong)} slot occupancy counters."
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_occupancy(apps, schema_editor):
+    Booking = apps.get_model('facilities', 'Booking')
+    SlotOccupancy = apps.get_model('facilities', 'SlotOccupancy')
+    counts = (
+        Booking.objects.filter(status='active')
+        .values('facility_id', 'slot_id', 'booking_date')
+        .annotate(total=Count('id'))
+    )
+    SlotOccupancy.objects.bulk_create([
+        SlotOccupancy(
+            facility_id=row['facility_id'],
+            slot_id=row['slot_id'],
+            booking_date=row['booking_date'],
+            active_count=row['total'],
+        )
+        for row in counts
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facilities', '0006_alter_booking_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('booking_date', models.DateField()),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='facilities.facility')),
+                ('slot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='facilities.timeslot')),
+            ],
+            options={
+                'verbose_name_plural': 'Slot occupancy',
+                'unique_together': {('facility', 'slot', 'booking_date')},
+            },
+        ),
+        migrations.RunPython(backfill_occupancy, migrations.RunPython.noop),
+    ]
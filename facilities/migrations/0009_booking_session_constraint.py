@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+
+
+def backfill_session(apps, schema_editor):
+    Booking = apps.get_model('facilities', 'Booking')
+    TimeSlot = apps.get_model('facilities', 'TimeSlot')
+    Booking.objects.update(
+        session=Subquery(TimeSlot.objects.filter(pk=OuterRef('slot_id')).values('session')[:1])
+    )
+
+
+def cancel_duplicate_sessions(apps, schema_editor):
+    """
+    The old count-then-insert code could leave a user with two active
+    bookings in one shift. Keep the earliest of each and cancel the rest
+    (giving their seats back) so the constraint below can be added.
+    """
+    Booking = apps.get_model('facilities', 'Booking')
+    SlotOccupancy = apps.get_model('facilities', 'SlotOccupancy')
+    clashes = Booking.objects.filter(status='active').values(
+        'user_id', 'booking_date', 'session'
+    ).annotate(total=Count('id')).filter(total__gt=1).order_by()
+    cancelled = 0
+    for clash in clashes:
+        duplicates = Booking.objects.filter(
+            status='active', user_id=clash['user_id'], booking_date=clash['booking_date'], session=clash['session']
+        ).order_by('created_at', 'id').values_list('id', 'facility_id', 'slot_id')[1:]
+        for booking_id, facility_id, slot_id in duplicates:
+            Booking.objects.filter(pk=booking_id).update(status='cancelled')
+            SlotOccupancy.objects.filter(
+                facility_id=facility_id, slot_id=slot_id, booking_date=clash['booking_date'], active_count__gt=0
+            ).update(active_count=F('active_count') - 1)
+            cancelled += 1
+    if cancelled:
+        print(f"\n  Cancelled {cancelled} active bookings that clashed with an earlier one in the same shift.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facilities', '0008_booking_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='session',
+            field=models.CharField(choices=[('morning', 'Morning'), ('evening', 'Evening')], default='', editable=False, max_length=10),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_session, migrations.RunPython.noop),
+        migrations.RunPython(cancel_duplicate_sessions, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'active')), fields=('user', 'booking_date', 'session'), name='booking_one_active_per_session'),
+        ),
+    ]
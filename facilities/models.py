@@ -1,4 +1,8 @@
 from django.db import models
+from django.db import transaction
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from users.models import User, Category
 from django.core.exceptions import ValidationError
 
@@ -7,6 +11,8 @@ class Facility(models.Model):
     max_duration = models.IntegerField(help_text="Max duration in minutes")
     is_active = models.BooleanField(default=True)
     image = models.ImageField(upload_to='facility_images/', null=True, blank=True)
+    # Resized/WebP/AVIF copies of image, see sports_management_system/images.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     capacity_per_slot = models.IntegerField(default=1, help_text="Number of bookings allowed per slot")
 
     def __str__(self):
@@ -26,8 +32,15 @@ class FacilityPricing(models.Model):
 class GalleryImage(models.Model):
     title = models.CharField(max_length=100, blank=True)
     image = models.ImageField(upload_to='gallery/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Gallery keyset pagination, newest first
+            models.Index(fields=['-uploaded_at', '-id'], name='gallery_uploaded_id_idx'),
+        ]
+
     def __str__(self):
         return self.title or "Image"
 
@@ -55,30 +68,73 @@ class Booking(models.Model):
     facility = models.ForeignKey(Facility, on_delete=models.CASCADE)
     slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
     booking_date = models.DateField()
+    # Copy of slot.session so the database can enforce one booking per shift
+    session = models.CharField(max_length=10, choices=TimeSlot.SESSION_CHOICES, editable=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('user', 'facility', 'slot', 'booking_date')
+        constraints = [
+            # Cancelled bookings are kept for history, so only live ones block rebooking the slot
+            models.UniqueConstraint(
+                fields=['user', 'facility', 'slot', 'booking_date'],
+                condition=~models.Q(status='cancelled'),
+                name='booking_unique_unless_cancelled',
+            ),
+            # One active booking per shift per day (also rules out double-booking a slot)
+            models.UniqueConstraint(
+                fields=['user', 'booking_date', 'session'],
+                condition=models.Q(status='active'),
+                name='booking_one_active_per_session',
+            ),
+        ]
+        indexes = [
+            # Per-user rules: future-day limit, shift limit, game diversity
+            models.Index(fields=['user', 'booking_date', 'status'], name='booking_user_date_status_idx'),
+            # Capacity recounts only ever look at active bookings
+            models.Index(fields=['facility', 'slot', 'booking_date'], condition=models.Q(status='active'), name='booking_active_slot_idx'),
+            # Date-range scans (dashboards, lifecycle jobs)
+            models.Index(fields=['booking_date', 'status'], name='booking_date_status_idx'),
+        ]
 
     def clean(self):
+        # Overlapping active bookings are rejected by the booking_one_active_per_session constraint
         if self.user.status != 'approved':
             raise ValidationError("User is not approved to make bookings.")
-        
-        overlapping_bookings = Booking.objects.filter(
-            user=self.user,
-            booking_date=self.booking_date,
-            slot=self.slot,
-            status='active'
-        ).exclude(id=self.id)
-        
-        if overlapping_bookings.exists():
-             raise ValidationError("You already have an active booking for this slot.")
-
-    def save(self, *args, **kwargs):
-        self.clean()
+
+    def save(self, *args, skip_clean=False, **kwargs):
+        # skip_clean is for callers that already ran facilities.booking_rules
+        if not skip_clean:
+            self.clean()
+        self.session = self.slot.session
         super().save(*args, **kwargs)
 
+class BookingArchive(models.Model):
+    """
+    Completed and cancelled bookings moved out of Booking once they are old
+    enough (see facilities.history). Rows keep their original Booking id (a
+    BigIntegerField, matching Booking's BigAutoField), so references like
+    reference numbers stay the same.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bookings')
+    facility = models.ForeignKey(Facility, on_delete=models.CASCADE)
+    slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
+    booking_date = models.DateField()
+    session = models.CharField(max_length=10, choices=TimeSlot.SESSION_CHOICES)
+    status = models.CharField(max_length=10, choices=Booking.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            # A user's history, newest first
+            models.Index(fields=['user', '-booking_date', '-id'], name='archive_user_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.facility} on {self.booking_date} ({self.status}, archived)"
+
 class FacilityClosure(models.Model):
     """
     Dates when the facility is closed.
@@ -97,3 +153,62 @@ class FacilityClosure(models.Model):
         target = self.facility.facility_name if self.facility else "ALL Facilities"
         return f"Closed: {target} on {self.date} ({self.description})"
 
+
+class SlotOccupancy(models.Model):
+    """
+    Running count of active bookings for one facility slot on one date.
+    Reservations bump it with a conditional UPDATE, so capacity is enforced
+    by the database instead of a count-then-insert in the view.
+    """
+    facility = models.ForeignKey(Facility, on_delete=models.CASCADE, related_name='occupancy')
+    slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
+    booking_date = models.DateField()
+    active_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('facility', 'slot', 'booking_date')
+        verbose_name_plural = "Slot occupancy"
+        indexes = [
+            # Calendar windows across all facilities
+            models.Index(fields=['booking_date'], name='occupancy_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facility} {self.slot} on {self.booking_date}: {self.active_count}"
+
+@receiver(post_delete, sender=Booking)
+def release_deleted_booking(sender, instance, **kwargs):
+    """Deleting an active booking (admin, cascades, cleanup scripts) frees its seat."""
+    from .reservations import release_slot
+    release_slot(instance)
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=Facility)
+@receiver(post_delete, sender=FacilityClosure)
+@receiver(post_save, sender=FacilityClosure)
+def invalidate_availability(sender, instance, **kwargs):
+    from .availability import invalidate
+    if sender is Facility:
+        facility_id = instance.pk
+    else:
+        # A closure without a facility applies to all of them
+        facility_id = instance.facility_id
+    transaction.on_commit(lambda: invalidate(facility_id))
+
+
+@receiver(post_save, sender=Facility)
+@receiver(post_delete, sender=Facility)
+def invalidate_catalogue(sender, instance, **kwargs):
+    from .catalogue import invalidate
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Facility)
+@receiver(post_save, sender=GalleryImage)
+def generate_image_variants(sender, instance, **kwargs):
+    from sports_management_system import images
+    if not images.is_stale(instance.image, instance.image_variants):
+        return
+    from .catalogue import invalidate
+    images.process_on_commit(instance, 'image', 'image_variants', then=invalidate if sender is Facility else None)
@@ -0,0 +1,329 @@
+"""
+Slot reservation engine.
+
+Capacity is tracked in SlotOccupancy rows. A booking is admitted by a
+conditional UPDATE (active_count < capacity) inside the same transaction
+that inserts the Booking, so concurrent requests can never overbook a slot:
+the database serialises the UPDATEs on the counter row and the loser sees
+zero rows affected.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Subquery
+from django.db.models.functions import Greatest
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .availability import invalidate
+from .models import Booking, Facility, SlotOccupancy
+
+# Sent after commit whenever seats are given back (cancel, reject, delete) on
+# a slot dated today or later, with facility_id, slot_id, booking_date and
+# seats. Hook for a waitlist to offer the freed seat straight away.
+seat_released = Signal()
+
+
+def _notify_released(facility_id, slot_id, booking_date, seats=1):
+    if booking_date < timezone.localdate():
+        # Completion, archive cleanup or cascades: the slot is already over
+        return
+    transaction.on_commit(lambda: seat_released.send(
+        sender=Booking, facility_id=facility_id, slot_id=slot_id, booking_date=booking_date, seats=seats
+    ))
+
+
+class SlotFullError(ValidationError):
+    """Raised when a slot has no remaining capacity."""
+
+
+def _admit(facility, slot, booking_date):
+    """
+    Try to take one seat on the counter row. Returns True on success.
+    Capacity is read in the same statement, not from the (possibly cached)
+    facility instance, so a capacity change applies to the very next booking.
+    """
+    return SlotOccupancy.objects.filter(
+        facility=facility,
+        slot=slot,
+        booking_date=booking_date,
+        active_count__lt=Subquery(Facility.objects.filter(pk=facility.pk).values('capacity_per_slot')[:1]),
+    ).update(active_count=F('active_count') + 1) == 1
+
+
+def _take_seat(facility, slot, booking_date):
+    """
+    Take one seat or raise SlotFullError. Must run inside a transaction
+    that also writes the booking.
+    """
+    admitted = _admit(facility, slot, booking_date)
+    if not admitted:
+        # First booking for this slot/date (or the slot is full). Make sure
+        # the counter row exists, seeded from any bookings made without it,
+        # and try again: it may just have been created by a concurrent request.
+        SlotOccupancy.objects.get_or_create(
+            facility=facility,
+            slot=slot,
+            booking_date=booking_date,
+            defaults={'active_count': lambda: Booking.objects.filter(
+                facility=facility,
+                slot=slot,
+                booking_date=booking_date,
+                status='active'
+            ).count()},
+        )
+        admitted = _admit(facility, slot, booking_date)
+
+    if not admitted:
+        raise SlotFullError(f"Slot is full! (Capacity: {facility.capacity_per_slot})")
+
+
+# How a violation of booking_one_active_per_session shows up in the error:
+# PostgreSQL and MySQL name the constraint, SQLite lists its columns
+_SESSION_CONFLICT = (
+    'booking_one_active_per_session',
+    ', '.join(f'{Booking._meta.db_table}.{column}' for column in ('user_id', 'booking_date', 'session')),
+)
+
+
+def _integrity_message(error, slot):
+    """Map a booking constraint violation to the message the rules would have shown."""
+    if any(marker in str(error) for marker in _SESSION_CONFLICT):
+        return f"You can only make ONE booking per shift ({slot.session}) per day."
+    return "You already have a booking for this slot."
+
+
+def reserve_slot(user, facility, slot, booking_date, validated=False):
+    """
+    Atomically admit and create an active booking.
+    Raises SlotFullError if the slot is at capacity. Pass validated=True when
+    the booking rules have already been evaluated to skip Booking.clean().
+    """
+    try:
+        with transaction.atomic():
+            _take_seat(facility, slot, booking_date)
+            booking = Booking(
+                user=user,
+                facility=facility,
+                slot=slot,
+                booking_date=booking_date,
+                status='active'
+            )
+            booking.save(skip_clean=validated)
+            return booking
+    except IntegrityError as e:
+        # The seat taken above is rolled back with the failed insert
+        raise ValidationError(_integrity_message(e, slot))
+
+
+def activate_booking(booking):
+    """Move a pending booking to active, taking a seat for it."""
+    if booking.status == 'active':
+        return booking
+    previous_status = booking.status
+    try:
+        with transaction.atomic():
+            _take_seat(booking.facility, booking.slot, booking.booking_date)
+            booking.status = 'active'
+            booking.save()
+            return booking
+    except IntegrityError as e:
+        booking.status = previous_status
+        raise ValidationError(_integrity_message(e, booking.slot))
+
+
+def deactivate_booking(booking, status='cancelled'):
+    """
+    Move a pending or active booking out (reject/cancel), releasing its seat
+    if it held one. The move is a conditional UPDATE on the status stored in
+    the database, not the one on this instance, so cancelling the same booking
+    twice (concurrently, or from a stale copy) releases the seat only once.
+    """
+    with transaction.atomic():
+        for previous in ('active', 'pending'):
+            if Booking.objects.filter(pk=booking.pk, status=previous).update(status=status) == 1:
+                booking.status = status
+                if previous == 'active':
+                    _release(booking.facility_id, booking.slot_id, booking.booking_date)
+                    transaction.on_commit(lambda: invalidate(booking.facility_id))
+                return booking
+        # Already cancelled, completed or gone: nothing to release
+        booking.refresh_from_db(fields=['status'])
+        return booking
+
+
+def _release(facility_id, slot_id, booking_date, seats=1):
+    """Give back seats on a counter row. Callers must know they were held."""
+    SlotOccupancy.objects.filter(
+        facility_id=facility_id,
+        slot_id=slot_id,
+        booking_date=booking_date,
+    ).update(active_count=Greatest(F('active_count') - seats, 0))
+    _notify_released(facility_id, slot_id, booking_date, seats)
+
+
+def release_slot(booking):
+    """Give back the seat held by an active booking (used when one is deleted)."""
+    if booking.status != 'active':
+        return
+    _release(booking.facility_id, booking.slot_id, booking.booking_date)
+
+
+def resync_occupancy(facility_id, slot_id, booking_date):
+    """Recount one counter row from the bookings table (for out-of-band edits)."""
+    count = Booking.objects.filter(
+        facility_id=facility_id,
+        slot_id=slot_id,
+        booking_date=booking_date,
+        status='active'
+    ).count()
+    SlotOccupancy.objects.update_or_create(
+        facility_id=facility_id,
+        slot_id=slot_id,
+        booking_date=booking_date,
+        defaults={'active_count': count},
+    )
+    transaction.on_commit(lambda: invalidate(facility_id))
+
+
+def bulk_activate(bookings):
+    """
+    Approve a batch of bookings with set-based checks: a handful of queries
+    for the whole batch, and one counter UPDATE and one status UPDATE per slot.
+    Earlier requests win when a slot cannot take them all.
+    Returns {booking_id: (outcome, message)}; only 'approved' bookings were
+    changed, the others ('skipped', 'ineligible', 'conflict', 'full',
+    'error') are left as they were.
+    """
+    results = {}
+    candidates = []
+    for booking in bookings.select_related('facility', 'user').order_by('created_at', 'id'):
+        if booking.status == 'active':
+            results[booking.id] = ('skipped', "Already active.")
+        elif booking.status != 'pending':
+            results[booking.id] = ('skipped', f"Cannot approve a {booking.status} booking.")
+        elif booking.user.status != 'approved':
+            results[booking.id] = ('ineligible', "User is not approved to make bookings.")
+        else:
+            candidates.append(booking)
+    if not candidates:
+        return results
+
+    keys = {(b.facility_id, b.slot_id, b.booking_date) for b in candidates}
+    facility_ids = {key[0] for key in keys}
+    dates = {key[2] for key in keys}
+
+    # Make sure every slot has a counter row, seeded from bookings made without one
+    seeds = {
+        (row['facility_id'], row['slot_id'], row['booking_date']): row['total']
+        for row in Booking.objects.filter(
+            status='active', facility_id__in=facility_ids, booking_date__in=dates
+        ).values('facility_id', 'slot_id', 'booking_date').annotate(total=Count('id'))
+    }
+    SlotOccupancy.objects.bulk_create([
+        SlotOccupancy(facility_id=key[0], slot_id=key[1], booking_date=key[2], active_count=seeds.get(key, 0))
+        for key in keys
+    ], ignore_conflicts=True)
+    occupied = {
+        (f_id, s_id, b_date): count
+        for f_id, s_id, b_date, count in SlotOccupancy.objects.filter(
+            facility_id__in=facility_ids, booking_date__in=dates
+        ).values_list('facility_id', 'slot_id', 'booking_date', 'active_count')
+    }
+    taken_sessions = set(Booking.objects.filter(
+        status='active',
+        user_id__in={b.user_id for b in candidates},
+        booking_date__in=dates
+    ).values_list('user_id', 'booking_date', 'session'))
+
+    admitted = defaultdict(list)
+    for booking in candidates:
+        key = (booking.facility_id, booking.slot_id, booking.booking_date)
+        session = (booking.user_id, booking.booking_date, booking.session)
+        if session in taken_sessions:
+            results[booking.id] = ('conflict', f"You can only make ONE booking per shift ({booking.session}) per day.")
+        elif occupied.get(key, 0) + len(admitted[key]) >= booking.facility.capacity_per_slot:
+            results[booking.id] = ('full', f"Slot is full! (Capacity: {booking.facility.capacity_per_slot})")
+        else:
+            admitted[key].append(booking)
+            taken_sessions.add(session)
+
+    try:
+        with transaction.atomic():
+            # Lock the candidates; any that stopped being pending since they were read are left alone
+            still_pending = set(Booking.objects.select_for_update().filter(
+                pk__in=[b.id for group in admitted.values() for b in group], status='pending'
+            ).values_list('pk', flat=True))
+            approved = []
+            for (facility_id, slot_id, booking_date), group in admitted.items():
+                for booking in group:
+                    if booking.id not in still_pending:
+                        results[booking.id] = ('skipped', "Changed meanwhile, no longer pending.")
+                group = [b for b in group if b.id in still_pending]
+                if not group:
+                    continue
+                capacity = group[0].facility.capacity_per_slot
+                # Live bookings may have taken seats since we read the counters
+                took_seats = SlotOccupancy.objects.filter(
+                    facility_id=facility_id,
+                    slot_id=slot_id,
+                    booking_date=booking_date,
+                    active_count__lte=capacity - len(group),
+                ).update(active_count=F('active_count') + len(group))
+                if not took_seats:
+                    for booking in group:
+                        results[booking.id] = ('full', f"Slot is full! (Capacity: {capacity})")
+                    continue
+                activated = Booking.objects.filter(
+                    pk__in=[b.id for b in group], status='pending'
+                ).update(status='active')
+                if activated != len(group):
+                    # Seats were taken for rows that changed under us; undo the whole batch
+                    raise IntegrityError("Bookings changed while being approved.")
+                approved.extend(group)
+    except IntegrityError:
+        # A conflicting booking landed mid-batch; nothing was applied
+        for group in admitted.values():
+            for booking in group:
+                results[booking.id] = ('error', "Conflicting booking was made meanwhile, try again.")
+        return results
+
+    for booking in approved:
+        results[booking.id] = ('approved', "Approved.")
+    for facility_id in {b.facility_id for b in approved}:
+        transaction.on_commit(lambda f_id=facility_id: invalidate(f_id))
+    return results
+
+
+def bulk_deactivate(bookings, status='cancelled'):
+    """
+    Reject/cancel a batch of pending or active bookings. The rows are locked
+    and re-read inside the transaction, each status UPDATE is guarded by the
+    status it expects, and seats are released only for the active bookings
+    actually moved (one counter UPDATE per slot).
+    Returns {booking_id: (outcome, message)}.
+    """
+    results = {}
+    active = defaultdict(list)
+    pending = []
+    with transaction.atomic():
+        for booking in bookings.select_for_update().only('id', 'status', 'facility_id', 'slot_id', 'booking_date'):
+            if booking.status == 'active':
+                active[(booking.facility_id, booking.slot_id, booking.booking_date)].append(booking.id)
+            elif booking.status == 'pending':
+                pending.append(booking.id)
+            else:
+                results[booking.id] = ('skipped', f"Already {booking.status}.")
+
+        for (facility_id, slot_id, booking_date), ids in active.items():
+            moved = Booking.objects.filter(pk__in=ids, status='active').update(status=status)
+            if moved:
+                _release(facility_id, slot_id, booking_date, moved)
+        Booking.objects.filter(pk__in=pending, status='pending').update(status=status)
+
+    for booking_id in pending + [b_id for ids in active.values() for b_id in ids]:
+        results[booking_id] = ('rejected', "Rejected.")
+    for facility_id in {key[0] for key in active}:
+        transaction.on_commit(lambda f_id=facility_id: invalidate(f_id))
+    return results
@@ -0,0 +1,42 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from sports_management_system import images
+
+register = template.Library()
+
+
+@register.filter
+def srcset(manifest, fmt):
+    """{{ facility.image_variants|srcset:'webp' }}"""
+    return images.srcset(manifest, fmt)
+
+
+@register.simple_tag
+def picture(src, manifest, alt='', sizes='100vw', css='', loading=''):
+    """
+    <picture> with AVIF/WebP sources and a JPEG/PNG fallback srcset, e.g.
+    {% picture facility.image_url facility.image_variants alt=facility.facility_name sizes="33vw" %}
+    Falls back to a plain <img> until variants have been generated.
+    """
+    manifest = manifest or {}
+    formats = manifest.get('formats', {})
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}" sizes="{}">',
+        ((fmt, images.srcset(manifest, fmt), sizes) for fmt in images.MODERN_FORMATS if fmt in formats)
+    )
+    fallback = [images.srcset(manifest, fmt) for fmt in ('jpeg', 'png') if fmt in formats]
+    if fallback and manifest.get('width'):
+        # The original is the largest candidate
+        fallback.append(f"{src} {manifest['width']}w")
+    return format_html(
+        # display: contents, so the <img> sizes against the caller's container as before
+        '<picture class="contents">{}<img src="{}"{} alt="{}" class="{}"{}{}></picture>',
+        sources,
+        src,
+        format_html(' srcset="{}" sizes="{}"', ', '.join(fallback), sizes) if fallback else '',
+        alt,
+        css,
+        format_html(' width="{}" height="{}"', manifest['width'], manifest['height']) if manifest.get('width') else '',
+        format_html(' loading="{}"', loading) if loading else '',
+    )
@@ -6,8 +6,13 @@ app_name = 'facilities'
 urlpatterns = [
     path('', views.facility_list, name='list'),
     path('book/<int:facility_id>/', views.book_facility, name='book'),
+    path('<int:facility_id>/availability.json', views.availability_json, name='availability'),
     path('my-bookings/', views.my_bookings, name='my_bookings'),
+    path('my-bookings/export.csv', views.export_bookings_csv, name='export_bookings_csv'),
+    path('my-bookings/export.ics', views.export_bookings_ical, name='export_bookings_ical'),
     path('cancel-booking/<int:booking_id>/', views.cancel_booking, name='cancel_booking'),
     path('gallery/', views.gallery_view, name='gallery'),
+    path('gallery/page.json', views.gallery_page_json, name='gallery_page'),
     path('calendar/', views.calendar_view, name='calendar'),
+    path('calendar/week.json', views.calendar_week_json, name='calendar_week'),
 ]
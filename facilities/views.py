@@ -1,20 +1,30 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, urlsafe_base64_decode, urlsafe_base64_encode
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Q
-from .models import Facility, TimeSlot, Booking, FacilityPricing
+from django.core.exceptions import ValidationError
+from .models import TimeSlot, Booking, FacilityPricing, SlotOccupancy
+from .reservations import deactivate_booking, reserve_slot
+from .booking_rules import load_context, evaluate
+from .availability import get_availability, default_window
+from .history import past_bookings, upcoming_bookings, user_history
+from . import catalogue, exports
 from payments.models import Payment
+from users.memberships import get_active_membership
 import uuid
 
 @login_required
 def facility_list(request):
-    facilities = Facility.objects.filter(is_active=True)
+    facilities = catalogue.active_facilities()
     return render(request, 'facilities/list.html', {'facilities': facilities})
 
 @login_required
 def book_facility(request, facility_id):
-    facility = get_object_or_404(Facility, pk=facility_id)
+    facility = catalogue.get_facility_or_404(facility_id)
     print(f"DEBUG: Facility {facility_id} loaded - View Executed")
     slots = list(TimeSlot.objects.all().order_by('start_time'))
     
@@ -26,16 +36,12 @@ def book_facility(request, facility_id):
         end_dt = dt + timedelta(minutes=40)
         slot.display_end_time = end_dt.time()
 
-    user_category = request.user.category
-    
-    # Check if user has an active membership
-    from users.models import Membership
-    active_membership = Membership.objects.filter(
-        user=request.user,
-        is_active=True
-    ).first()
-    
-    has_valid_membership = active_membership and active_membership.is_valid() if active_membership else False
+    # Check if user has an active membership (from the database when booking)
+    if request.method == 'POST':
+        active_membership = get_active_membership(request.user, fresh=True)
+    else:
+        active_membership = request.membership
+    has_valid_membership = active_membership.is_valid() if active_membership else False
     
     if request.method == 'POST':
         if not has_valid_membership:
@@ -48,98 +54,25 @@ def book_facility(request, facility_id):
         try:
             from datetime import datetime
             booking_date = datetime.strptime(booking_date_str, '%Y-%m-%d').date()
-            slot = TimeSlot.objects.get(pk=slot_id)
-        except (ValueError, TimeSlot.DoesNotExist):
+            slot = {str(s.pk): s for s in slots}[slot_id]
+        except (TypeError, ValueError, KeyError):
             messages.error(request, "Invalid date or time slot.")
             return redirect('facilities:book', facility_id=facility.id)
             
-        today = timezone.now().date()
-        if booking_date < today:
-            messages.error(request, "Cannot book past dates.")
-            return redirect('facilities:book', facility_id=facility.id)
-            
-        # 1. Facility Closure Check
-        from .models import FacilityClosure
-        closure = FacilityClosure.objects.filter(date=booking_date).filter(Q(facility=facility) | Q(facility__isnull=True)).first()
-        if closure:
-            messages.error(request, f"Facility closed on {booking_date}: {closure.description}")
-            return redirect('facilities:book', facility_id=facility.id)
-
-        # 2. Future Booking Limit (Max 1 distinct future date allowed)
-        if booking_date > today:
-            # Get all future booking dates for this user
-            future_dates = Booking.objects.filter(
-                user=request.user, 
-                booking_date__gt=today, 
-                status='active'
-            ).values_list('booking_date', flat=True).distinct()
-            
-            # If user has future bookings on dates OTHER than the requested date
-            existing_future_days = set(future_dates)
-            if len(existing_future_days) >= 1 and booking_date not in existing_future_days:
-                 messages.error(request, f"You can only have bookings for ONE future day at a time. You already have bookings for {list(existing_future_days)[0]}.")
-                 return redirect('facilities:book', facility_id=facility.id)
-
-        # 3. Shift Limit Check (Max 1 booking per shift/session per day)
-        # Check if user has ANY booking in this session on this date
-        shift_booking = Booking.objects.filter(
-            user=request.user,
-            booking_date=booking_date,
-            slot__session=slot.session,
-            status='active'
-        ).exists()
-        
-        if shift_booking:
-            messages.error(request, f"You can only make ONE booking per shift ({slot.session}) per day.")
-            return redirect('facilities:book', facility_id=facility.id)
-
-        # 4. Game Diversity Rule (Cannot play same game in two shifts, unless urgent)
-        # Check if user played SAME facility in OTHER shifts today
-        same_game_bookings = Booking.objects.filter(
-            user=request.user,
-            booking_date=booking_date,
-            facility=facility, # Same game
-            status='active'
-        ).exclude(slot__session=slot.session) # In other sessions
-        
-        if same_game_bookings.exists():
-            # Exception Logic: Allow if booking is < 1 hour from start
-            # Combine date and time
-            booking_datetime = datetime.combine(booking_date, slot.start_time)
-            # Make timezone aware if needed (assuming server is naive or consistent)
-            # If start_time is naive and timezone.now() is aware, we need consistency.
-            # Lets try mostly safe comparison:
-            current_time = datetime.now() # Naive
-            time_diff = booking_datetime - current_time
-            
-            # If booking is in future and diff > 1 hour -> BLOCK
-            if time_diff.total_seconds() > 3600:
-                 messages.error(request, f"You cannot book {facility.facility_name} in multiple shifts on the same day, unless it is less than 1 hour before the slot starts.")
-                 return redirect('facilities:book', facility_id=facility.id)
-
-        # Check Capacity (Replaces global slot check)
-        active_bookings_count = Booking.objects.filter(
-            facility=facility, 
-            slot=slot, 
-            booking_date=booking_date, 
-            status='active'
-        ).count()
-        
-        if active_bookings_count >= facility.capacity_per_slot:
-            messages.error(request, f"Slot is full! (Capacity: {facility.capacity_per_slot})")
+        # Closure, future-day limit, one booking per shift, game diversity and capacity
+        context = load_context(
+            request.user, facility, slot, booking_date,
+            today=timezone.now().date(),
+            now=timezone.localtime(timezone.now()).replace(tzinfo=None),
+        )
+        error = evaluate(context)
+        if error:
+            messages.error(request, error)
             return redirect('facilities:book', facility_id=facility.id)
 
+        # Check Capacity and create the booking in one transaction
         try:
-            booking = Booking(
-                user=request.user,
-                facility=facility,
-                slot=slot,
-                booking_date=booking_date,
-                status='active'
-            )
-            # clean() handles basic validation too
-            booking.clean()
-            booking.save()
+            reserve_slot(request.user, facility, slot, booking_date, validated=True)
             
             messages.success(request, f"Successfully booked {facility.facility_name} for {booking_date}!")
             return redirect('facilities:my_bookings')
@@ -152,110 +85,230 @@ def book_facility(request, facility_id):
             return redirect('facilities:book', facility_id=facility.id)
 
     # Prepare Calendar Data
-    import json
-    from .models import FacilityClosure
-    
-    # 1. Closures
-    closures = FacilityClosure.objects.filter(
-        date__gte=timezone.now().date()
-    ).filter(Q(facility=facility) | Q(facility__isnull=True)).values_list('date', 'description')
+    today = timezone.now().date()
     
-    closures_data = [{'date': c[0].strftime('%Y-%m-%d'), 'desc': c[1]} for c in closures]
+    # 1. Closures and 2. Slot Availability (Count per slot per day), cached per facility
+    availability, _, _ = get_availability(facility, *default_window(today))
     
-    # 2. User Future Bookings
+    # 3. User Future Bookings
     user_future_bookings = Booking.objects.filter(
         user=request.user,
-        booking_date__gt=timezone.now().date(),
+        booking_date__gt=today,
         status='active'
     ).values_list('booking_date', flat=True).distinct()
     
     user_future_dates = [d.strftime('%Y-%m-%d') for d in user_future_bookings]
-
-    # 3. Slot Availability (Count per slot per day)
-    future_facility_bookings = Booking.objects.filter(
-        facility=facility,
-        booking_date__gte=timezone.now().date(),
-        status='active'
-    ).values('booking_date', 'slot_id')
-    
-    availability_map = {}
-    for b in future_facility_bookings:
-        d_str = b['booking_date'].strftime('%Y-%m-%d')
-        s_id = b['slot_id']
-        if d_str not in availability_map: availability_map[d_str] = {}
-        availability_map[d_str][s_id] = availability_map[d_str].get(s_id, 0) + 1
         
     return render(request, 'facilities/book.html', {
         'facility': facility, 
         'slots': slots,
         'today': timezone.localtime(timezone.now()).date(),
         'current_datetime': timezone.localtime(timezone.now()), # Local Time passed 
-        'user_category': user_category,
+        'user_category': request.user.category,
         'active_membership': active_membership,
         'has_valid_membership': has_valid_membership,
         # current_datetime removed (duplicate)
-        'closures_data': closures_data,
+        'closures_data': availability['closures'],
         'user_future_dates': user_future_dates,
-        'slot_availability_data': availability_map,
+        'slot_availability_data': availability['slots'],
         'facility_capacity': facility.capacity_per_slot
     })
 
 
+@login_required
+def availability_json(request, facility_id):
+    """Slot counts and closures for ?from=&to= (YYYY-MM-DD), with ETag revalidation"""
+    from datetime import datetime, timedelta
+    from .availability import MAX_WINDOW_DAYS
+    
+    facility = catalogue.get_facility_or_404(facility_id)
+    date_from, date_to = default_window(timezone.now().date())
+    try:
+        if request.GET.get('from'):
+            date_from = datetime.strptime(request.GET['from'], '%Y-%m-%d').date()
+        if request.GET.get('to'):
+            date_to = datetime.strptime(request.GET['to'], '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'error': "Dates must be in YYYY-MM-DD format."}, status=400)
+    if date_to < date_from or date_to - date_from > timedelta(days=MAX_WINDOW_DAYS):
+        return JsonResponse({'error': f"Window must be between 0 and {MAX_WINDOW_DAYS} days."}, status=400)
+    
+    _, body, etag = get_availability(facility, date_from, date_to)
+    
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+BOOKINGS_PAGE_SIZE = 20
+
+def _encode_booking_cursor(key):
+    booking_date, booking_id = key
+    return urlsafe_base64_encode(f"{booking_date.isoformat()}|{booking_id}".encode())
+
+def _decode_booking_cursor(cursor):
+    """(booking_date, id) of the last booking already shown; ValueError if malformed"""
+    from datetime import date
+    booking_date, booking_id = urlsafe_base64_decode(cursor).decode().split('|')
+    return date.fromisoformat(booking_date), int(booking_id)
+
 @login_required
 def my_bookings(request):
-    bookings = Booking.objects.filter(user=request.user).order_by('-booking_date')
+    """Upcoming (soonest first) and past (newest first) tabs, keyset-paginated with ?cursor="""
+    tab = 'past' if request.GET.get('tab') == 'past' else 'upcoming'
+    today = timezone.now().date()
+    try:
+        after = _decode_booking_cursor(request.GET['cursor']) if request.GET.get('cursor') else None
+    except ValueError:
+        after = None
+    page = past_bookings if tab == 'past' else upcoming_bookings
+    bookings, next_key = page(request.user, today, after, BOOKINGS_PAGE_SIZE)
     return render(request, 'facilities/my_bookings.html', {
         'bookings': bookings,
-        'today': timezone.now().date()
+        'tab': tab,
+        'tabs': [('upcoming', 'Upcoming'), ('past', 'Past')],
+        'next_cursor': _encode_booking_cursor(next_key) if next_key else None,
+        'today': today
     })
 
-def gallery_view(request):
-    from .models import GalleryImage
-    images = GalleryImage.objects.all().order_by('-uploaded_at')
-    return render(request, 'facilities/gallery.html', {'images': images})
+@login_required
+def export_bookings_csv(request):
+    response = StreamingHttpResponse(exports.csv_lines(user_history(request.user)), content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="my-bookings.csv"'
+    return response
 
 @login_required
-def calendar_view(request):
-    """Display calendar view with facility availability"""
-    import json
-    from datetime import datetime, timedelta
-    
-    facilities = Facility.objects.filter(is_active=True)
-    slots = TimeSlot.objects.all()
+def export_bookings_ical(request):
+    lines = exports.ical_lines(user_history(request.user), request.get_host())
+    response = StreamingHttpResponse(lines, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="my-bookings.ics"'
+    return response
+
+GALLERY_PAGE_SIZE = 24
+# Roughly the first screenful; everything after it is lazy-loaded by the browser
+GALLERY_EAGER_IMAGES = 6
+
+def _encode_cursor(image):
+    raw = f"{image.uploaded_at.isoformat()}|{image.id}"
+    return urlsafe_base64_encode(raw.encode())
+
+def _decode_cursor(cursor):
+    """(uploaded_at, id) of the last image already shown; ValueError if malformed"""
+    from datetime import datetime
+    uploaded_at, image_id = urlsafe_base64_decode(cursor).decode().split('|')
+    return datetime.fromisoformat(uploaded_at), int(image_id)
+
+def _gallery_page(cursor=None):
+    """
+    One page of the gallery, newest first, and the cursor for the next one (or None).
+    Keyset pagination on (uploaded_at, id), so deep pages cost the same as the first.
+    """
+    from .models import GalleryImage
+    images = GalleryImage.objects.order_by('-uploaded_at', '-id')
+    if cursor:
+        uploaded_at, image_id = _decode_cursor(cursor)
+        images = images.filter(Q(uploaded_at__lt=uploaded_at) | Q(uploaded_at=uploaded_at, id__lt=image_id))
+    images = list(images[:GALLERY_PAGE_SIZE + 1])
+    next_cursor = _encode_cursor(images[GALLERY_PAGE_SIZE - 1]) if len(images) > GALLERY_PAGE_SIZE else None
+    images = images[:GALLERY_PAGE_SIZE]
+    for index, image in enumerate(images):
+        image.loading = 'eager' if not cursor and index < GALLERY_EAGER_IMAGES else 'lazy'
+    return images, next_cursor
+
+def gallery_view(request):
+    try:
+        images, next_cursor = _gallery_page(request.GET.get('cursor'))
+    except ValueError:
+        images, next_cursor = _gallery_page()
+    return render(request, 'facilities/gallery.html', {'images': images, 'next_cursor': next_cursor})
+
+def gallery_page_json(request):
+    """Further gallery pages for infinite scroll (?cursor=)"""
+    try:
+        images, next_cursor = _gallery_page(request.GET.get('cursor'))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+    html = render_to_string('facilities/gallery_items.html', {'images': images}, request=request)
+    return JsonResponse({'html': html, 'next': next_cursor})
+
+CALENDAR_MAX_WEEKS = 52
+
+def _calendar_window(request):
+    """Parse ?facility=&week= into (facility_id or None, week offset from this week)"""
+    facility_id = request.GET.get('facility') or None
+    week = request.GET.get('week') or 0
+    try:
+        facility_id = int(facility_id) if facility_id is not None else None
+        week = min(max(int(week), 0), CALENDAR_MAX_WEEKS)
+    except ValueError:
+        facility_id, week = None, 0
+    return facility_id, week
+
+def _calendar_week(facility_id, week):
+    """Per-(facility, slot, date) booking counts for one week, starting today for week 0"""
+    from datetime import timedelta
     
-    # Get bookings for the next 30 days
     today = timezone.now().date()
-    end_date = today + timedelta(days=30)
+    start = today + timedelta(weeks=week)
+    end = start + timedelta(days=6)
     
-    bookings = Booking.objects.filter(
-        booking_date__gte=today,
-        booking_date__lte=end_date,
-        status='active'
-    ).values('facility_id', 'slot_id', 'booking_date')
+    occupancy = SlotOccupancy.objects.filter(
+        booking_date__gte=start,
+        booking_date__lte=end,
+        facility__is_active=True,
+        active_count__gt=0
+    )
+    if facility_id:
+        occupancy = occupancy.filter(facility_id=facility_id)
+    
+    # {date: {facility_id: {slot_id: count}}}
+    counts = {}
+    for f_id, s_id, b_date, count in occupancy.values_list('facility_id', 'slot_id', 'booking_date', 'active_count'):
+        counts.setdefault(b_date.strftime('%Y-%m-%d'), {}).setdefault(str(f_id), {})[str(s_id)] = count
+    
+    return {
+        'week': week,
+        'start': start.strftime('%Y-%m-%d'),
+        'end': end.strftime('%Y-%m-%d'),
+        'has_next': week < CALENDAR_MAX_WEEKS,
+        'counts': counts,
+    }
+
+@login_required
+def calendar_view(request):
+    """Display calendar view with facility availability, one week at a time"""
+    facility_id, week = _calendar_window(request)
+    
+    facilities = catalogue.active_facilities()
+    slots = TimeSlot.objects.all().order_by('start_time')
     
-    # Convert to JSON for JavaScript
-    bookings_list = []
-    for booking in bookings:
-        bookings_list.append({
-            'facility_id': booking['facility_id'],
-            'slot_id': booking['slot_id'],
-            'date': booking['booking_date'].strftime('%Y-%m-%d')
-        })
-        
     return render(request, 'facilities/calendar.html', {
-        'bookings_json': json.dumps(bookings_list),
+        'calendar_data': _calendar_week(facility_id, week),
         'facilities': facilities,
-        'slots': slots
+        'slots': slots,
+        'selected_facility': facility_id,
     })
+
+@login_required
+def calendar_week_json(request):
+    """Lazy-loaded further weeks for the calendar (?facility=&week=)"""
+    facility_id, week = _calendar_window(request)
+    return JsonResponse(_calendar_week(facility_id, week))
     
 @login_required
 def cancel_booking(request, booking_id):
-    booking = get_object_or_404(Booking, pk=booking_id, user=request.user)
+    booking = get_object_or_404(Booking.objects.select_related('slot'), pk=booking_id, user=request.user)
     
     if booking.booking_date < timezone.now().date():
          messages.error(request, "Cannot cancel past bookings.")
+    elif booking.status not in ('active', 'pending'):
+        messages.error(request, f"This booking is already {booking.status}.")
     else:
-        booking.delete() # Or set status='cancelled' if field exists. I'll check model.
+        # Kept as a cancelled row for history and analytics; the seat goes back to the slot
+        deactivate_booking(booking, status='cancelled')
         messages.success(request, "Booking cancelled successfully.")
         
     return redirect('facilities:my_bookings')
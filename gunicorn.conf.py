@@ -0,0 +1,6 @@
+# Gunicorn settings, read automatically from the project root.
+# Worker and thread counts also size the database pool in settings.py.
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
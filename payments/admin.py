@@ -1,7 +1,13 @@
 from django.contrib import admin
-from .models import Payment
+from .models import Payment, DailyRevenue
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ('user', 'amount', 'payment_type', 'payment_status', 'created_at')
     list_filter = ('payment_status', 'payment_type')
+
+@admin.register(DailyRevenue)
+class DailyRevenueAdmin(admin.ModelAdmin):
+    list_display = ('date', 'facility', 'category', 'payment_type', 'total_amount', 'payment_count')
+    list_filter = ('payment_type', 'facility', 'category')
+    date_hierarchy = 'date'
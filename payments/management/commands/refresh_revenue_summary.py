@@ -0,0 +1,41 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+from payments.models import Payment
+from payments.reports import refresh_daily_revenue, check_consistency, default_refresh_window
+
+
+class Command(BaseCommand):
+    help = 'Refresh the DailyRevenue rollups (last 2 days by default) and optionally check them against raw payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='Number of days, ending today, to refresh')
+        parser.add_argument('--since', help='Refresh from this date (YYYY-MM-DD) up to today')
+        parser.add_argument('--full', action='store_true', help='Rebuild from the first payment')
+        parser.add_argument('--verify', action='store_true', help='Only compare rollups with raw payments, do not write')
+
+    def handle(self, *args, **options):
+        start, end = default_refresh_window(options['days'])
+
+        if options['full']:
+            first = Payment.objects.aggregate(first=Min('created_at'))['first']
+            if first:
+                start = timezone.localtime(first).date()
+        elif options['since']:
+            try:
+                start = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--since must be in YYYY-MM-DD format.")
+
+        if options['verify']:
+            mismatches = check_consistency(start, end)
+            for day, rolled, raw in mismatches:
+                self.stdout.write(f"{day}: rollup {rolled} != payments {raw}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} days out of sync between {start} and {end}.")
+            self.stdout.write(self.style.SUCCESS(f"Revenue rollups match payments from {start} to {end}."))
+            return
+
+        written = refresh_daily_revenue(start, end)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed revenue from {start} to {end} ({written} rollup rows)."))
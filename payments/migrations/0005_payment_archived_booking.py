@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facilities', '0012_bookingarchive'),
+        ('payments', '0004_dailyrevenue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='archived_booking',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='facilities.bookingarchive'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:10
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    """Roll up every existing successful payment, so reports don't start from today."""
+    Payment = apps.get_model('payments', 'Payment')
+    DailyRevenue = apps.get_model('payments', 'DailyRevenue')
+    rows = Payment.objects.filter(payment_status='success').annotate(
+        day=TruncDate('created_at', tzinfo=timezone.get_current_timezone())
+    ).values(
+        'day',
+        'payment_type',
+        facility_ref=Coalesce('booking__facility_id', 'archived_booking__facility_id'),
+        category_ref=Coalesce('membership__membership_tier__category_id', 'user__category_id'),
+    ).annotate(
+        total=Sum('amount'),
+        count=Count('id'),
+    ).order_by()
+    DailyRevenue.objects.all().delete()
+    DailyRevenue.objects.bulk_create([
+        DailyRevenue(
+            date=row['day'],
+            facility_id=row['facility_ref'],
+            category_id=row['category_ref'],
+            payment_type=row['payment_type'],
+            total_amount=row['total'],
+            payment_count=row['count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_payment_archived_booking'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from users.models import User
-from facilities.models import Booking
+from facilities.models import Booking, BookingArchive
 
 class Payment(models.Model):
     PAYMENT_TYPE_CHOICES = [
@@ -15,6 +15,8 @@ class Payment(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     booking = models.ForeignKey(Booking, on_delete=models.SET_NULL, null=True, blank=True) # Optional - for old records
+    # Set when the booking is moved to the archive (booking is then cleared)
+    archived_booking = models.ForeignKey(BookingArchive, on_delete=models.SET_NULL, null=True, blank=True, editable=False)
     membership = models.ForeignKey('users.Membership', on_delete=models.SET_NULL, null=True, blank=True) # For membership purchases
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     payment_type = models.CharField(max_length=20, choices=PAYMENT_TYPE_CHOICES)
@@ -22,5 +24,35 @@ class Payment(models.Model):
     transaction_id = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Revenue rollups read successful payments by day
+            models.Index(fields=['payment_status', 'created_at'], name='payment_status_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.amount} ({self.payment_status})"
+
+class DailyRevenue(models.Model):
+    """
+    Successful payments rolled up per day, facility, category and payment type.
+    Rebuilt per day by payments.reports.refresh_daily_revenue, so dashboards
+    never have to scan the raw Payment table.
+    """
+    date = models.DateField()
+    facility = models.ForeignKey('facilities.Facility', on_delete=models.SET_NULL, null=True, blank=True)
+    category = models.ForeignKey('users.Category', on_delete=models.SET_NULL, null=True, blank=True)
+    payment_type = models.CharField(max_length=20, choices=Payment.PAYMENT_TYPE_CHOICES)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    payment_count = models.IntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Daily revenue"
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date'], name='dailyrevenue_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.payment_type}: {self.total_amount}"
@@ -0,0 +1,168 @@
+"""
+Revenue reporting.
+
+Successful payments are rolled up into DailyRevenue rows (one per day,
+facility, category and payment type). Reports read the rollups, so their
+cost depends on the number of days covered rather than the number of
+payments. Today is still moving, so it is always aggregated live.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import DailyRevenue, Payment
+
+
+def _successful_payments(start, end):
+    """
+    Successful payments created on local dates start..end (inclusive), with
+    their local date as `day`. The range is applied to created_at itself so
+    the (payment_status, created_at) index can be used.
+    """
+    tz = timezone.get_current_timezone()
+    return Payment.objects.filter(
+        payment_status='success',
+        created_at__gte=timezone.make_aware(datetime.combine(start, time.min), tz),
+        created_at__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    ).annotate(
+        day=TruncDate('created_at', tzinfo=tz)
+    )
+
+
+def _rollup(start, end):
+    return _successful_payments(start, end).values(
+        'day',
+        'payment_type',
+        facility_ref=Coalesce('booking__facility_id', 'archived_booking__facility_id'),
+        # Membership purchases belong to the tier's category; game payments to the user's
+        category_ref=Coalesce('membership__membership_tier__category_id', 'user__category_id'),
+    ).annotate(
+        total=Sum('amount'),
+        count=Count('id'),
+    ).order_by()
+
+
+def refresh_daily_revenue(start, end):
+    """Recompute the rollups for start..end (inclusive). Returns rows written."""
+    rows = [
+        DailyRevenue(
+            date=row['day'],
+            facility_id=row['facility_ref'],
+            category_id=row['category_ref'],
+            payment_type=row['payment_type'],
+            total_amount=row['total'],
+            payment_count=row['count'],
+        )
+        for row in _rollup(start, end)
+    ]
+    with transaction.atomic():
+        DailyRevenue.objects.filter(date__gte=start, date__lte=end).delete()
+        DailyRevenue.objects.bulk_create(rows)
+    return len(rows)
+
+
+def check_consistency(start, end):
+    """
+    Compare rollups with the raw payments, day by day.
+    Returns a list of (date, rollup_total, raw_total) for days that differ.
+    """
+    rolled = dict(
+        DailyRevenue.objects.filter(date__gte=start, date__lte=end)
+        .values('date').annotate(total=Sum('total_amount')).values_list('date', 'total')
+    )
+    raw = dict(
+        _successful_payments(start, end)
+        .values('day').annotate(total=Sum('amount')).order_by().values_list('day', 'total')
+    )
+    mismatches = []
+    for day in sorted(set(rolled) | set(raw)):
+        rolled_total = rolled.get(day) or Decimal('0')
+        raw_total = raw.get(day) or Decimal('0')
+        if rolled_total != raw_total:
+            mismatches.append((day, rolled_total, raw_total))
+    return mismatches
+
+
+def revenue_summary(start=None, end=None):
+    """
+    Revenue totals between two dates (inclusive; open-ended if None),
+    broken down by day, facility, category and payment type.
+    """
+    today = timezone.localdate()
+    end = min(end or today, today)
+
+    rollups = DailyRevenue.objects.filter(date__lt=today)
+    if start:
+        rollups = rollups.filter(date__gte=start)
+    if end < today:
+        rollups = rollups.filter(date__lte=end)
+    rows = list(rollups.values(
+        'date', 'payment_type', 'total_amount', 'payment_count',
+        facility_name=F('facility__facility_name'),
+        category_name=F('category__name'),
+    ))
+
+    if end == today and (start is None or start <= today):
+        live = _successful_payments(today, today).values(
+            'payment_type',
+            facility_name=F('booking__facility__facility_name'),
+            category_name=Coalesce('membership__membership_tier__category__name', 'user__category__name'),
+        ).annotate(
+            total_amount=Sum('amount'),
+            payment_count=Count('id'),
+        ).order_by()
+        rows += [dict(row, date=today) for row in live]
+
+    summary = {
+        'total': Decimal('0'),
+        'payments': 0,
+        'by_day': {},
+        'by_facility': {},
+        'by_category': {},
+        'by_payment_type': {},
+    }
+    for row in rows:
+        amount = row['total_amount']
+        summary['total'] += amount
+        summary['payments'] += row['payment_count']
+        for bucket, key in (
+            ('by_day', row['date'].strftime('%Y-%m-%d')),
+            ('by_facility', row['facility_name'] or 'No facility'),
+            ('by_category', row['category_name'] or 'Uncategorised'),
+            ('by_payment_type', row['payment_type']),
+        ):
+            summary[bucket][key] = summary[bucket].get(key, Decimal('0')) + amount
+    return summary
+
+
+def revenue_total():
+    """All-time successful revenue: rollups up to yesterday plus today's live payments."""
+    today = timezone.localdate()
+    rolled = DailyRevenue.objects.filter(date__lt=today).aggregate(total=Sum('total_amount'))['total']
+    live = _successful_payments(today, today).aggregate(total=Sum('amount'))['total']
+    return (rolled or Decimal('0')) + (live or Decimal('0'))
+
+
+def default_refresh_window(days=2):
+    """The last `days` local dates, ending today."""
+    today = timezone.localdate()
+    return today - timedelta(days=days - 1), today
+
+
+def catch_up_window(days=2):
+    """
+    Dates to refresh so no day is left out: from the last date that has
+    rollups (redone, it may have been rolled up while still moving), or from
+    the first payment if there are none, to today. Never less than the last
+    `days` days.
+    """
+    start, end = default_refresh_window(days)
+    last = DailyRevenue.objects.aggregate(last=Max('date'))['last']
+    if last is None:
+        first = Payment.objects.filter(payment_status='success').aggregate(first=Min('created_at'))['first']
+        last = timezone.localtime(first).date() if first else start
+    return min(start, last), end
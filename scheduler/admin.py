@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job, JobRun
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'schedule', 'next_run_at', 'locked_by', 'locked_until')
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ('job', 'status', 'started_at', 'duration', 'runner')
+    list_filter = ('status', 'job')
+    date_hierarchy = 'started_at'
@@ -0,0 +1,72 @@
+"""
+Minimal cron expressions: "minute hour day-of-month month day-of-week".
+
+Each field accepts *, numbers, ranges (1-5), lists (0,30) and steps (*/15,
+8-18/2). Day of week is 0-6 with 0 = Sunday. As in cron, when both
+day-of-month and day-of-week are restricted a day matches if either does.
+Times are evaluated in the current Django time zone.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+# (lowest, highest) for each field
+RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def _parse_field(text, lowest, highest):
+    values = set()
+    for part in text.split(','):
+        part, _, step = part.partition('/')
+        if part == '*':
+            start, end = lowest, highest
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = end = int(part)
+        step = int(step) if step else 1
+        if not (lowest <= start <= end <= highest) or step < 1:
+            raise ValueError(f"{text!r} is outside {lowest}-{highest}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class Cron:
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expected 5 cron fields, got {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(text, *bounds) for text, bounds in zip(fields, RANGES)
+        )
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def __str__(self):
+        return self.expression
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        in_month = day.day in self.days
+        # date.weekday() is Monday=0; cron counts from Sunday
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment):
+        """The first matching minute strictly after moment (an aware datetime)."""
+        local = timezone.localtime(moment).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day, earliest = local.date(), local.time()
+        # Any valid expression matches within a few years (Feb 29 is the worst case)
+        for _ in range(366 * 8):
+            if self._day_matches(day):
+                for hour in sorted(h for h in self.hours if h >= earliest.hour):
+                    for minute in sorted(self.minutes):
+                        if time(hour, minute) >= earliest:
+                            return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+            day += timedelta(days=1)
+            earliest = time(0, 0)
+        raise ValueError(f"{self.expression!r} never matches")
@@ -0,0 +1,100 @@
+"""
+Scheduled maintenance jobs.
+
+Each job is a plain function returning a one-line summary for its JobRun.
+Schedules are cron expressions in the project time zone (see scheduler.cron).
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from .cron import Cron
+
+# Bookings per bulk_deactivate call/transaction, so a backlog never becomes
+# one huge id list (SQLite caps bound parameters) or one long lock
+CHUNK_SIZE = 5000
+
+
+class ScheduledJob:
+    def __init__(self, name, schedule, func, lease=timedelta(hours=1)):
+        self.name = name
+        self.cron = Cron(schedule)
+        self.func = func
+        # How long a replica may hold the job before others assume it died
+        self.lease = lease
+
+    @property
+    def schedule(self):
+        return self.cron.expression
+
+
+def expire_memberships():
+    """Deactivate memberships whose end date has passed."""
+    from users.memberships import invalidate
+    from users.models import Membership
+
+    expired = Membership.objects.filter(is_active=True, end_date__lt=timezone.localdate())
+    user_ids = set(expired.values_list('user_id', flat=True))
+    count = expired.update(is_active=False)
+    for user_id in user_ids:
+        invalidate(user_id)
+    return f"Deactivated {count} expired memberships."
+
+
+def complete_bookings():
+    """
+    Mark active bookings from previous days completed, releasing their seats.
+    Today's bookings stay active even once their slot has ended: the
+    one-booking-per-shift rule only counts active bookings, so completing
+    them early would let the user book the same shift again.
+    """
+    from facilities.models import Booking
+    from facilities.reservations import bulk_deactivate
+
+    finished = Booking.objects.filter(status='active', booking_date__lt=timezone.localdate())
+    ids = list(finished.order_by('pk').values_list('pk', flat=True))
+    completed = 0
+    for start in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        results = bulk_deactivate(finished.filter(pk__gte=chunk[0], pk__lte=chunk[-1]), status='completed')
+        completed += sum(1 for outcome, _ in results.values() if outcome != 'skipped')
+    return f"Completed {completed} bookings."
+
+
+def refresh_revenue():
+    """Recompute revenue rollups from the last rolled-up day (at least yesterday) to today."""
+    from payments.reports import catch_up_window, refresh_daily_revenue
+    start, end = catch_up_window()
+    return f"Refreshed revenue from {start} to {end} ({refresh_daily_revenue(start, end)} rollup rows)."
+
+
+def archive_bookings():
+    from facilities.history import archive_bookings
+    return f"Archived {archive_bookings()} bookings."
+
+
+def image_variants():
+    """Regenerate image variants that are missing or stale, e.g. after a failed upload hook."""
+    out = StringIO()
+    call_command('generate_image_variants', stdout=out, stderr=out)
+    return out.getvalue().strip().split('\n')[-1]
+
+
+def student_lifecycle():
+    out = StringIO()
+    call_command('process_student_lifecycle', stdout=out)
+    return ' '.join(out.getvalue().split('\n')[1:]).strip()
+
+
+JOBS = [
+    ScheduledJob('expire_memberships', '5 0 * * *', expire_memberships),
+    ScheduledJob('complete_bookings', '15 0 * * *', complete_bookings),
+    # Reports read rollups for every day before today, so close yesterday off early
+    ScheduledJob('refresh_revenue', '20 0 * * *', refresh_revenue),
+    ScheduledJob('archive_bookings', '0 1 * * *', archive_bookings),
+    ScheduledJob('image_variants', '45 * * * *', image_variants),
+    # The command itself only promotes on April 30
+    ScheduledJob('student_lifecycle', '30 0 * * *', student_lifecycle),
+]
@@ -0,0 +1,55 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from scheduler import runner
+from scheduler.jobs import JOBS
+from scheduler.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Run scheduled maintenance jobs (see scheduler/jobs.py; --list shows them)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll', type=int, default=30, help='Seconds between checks for due jobs (default: 30)')
+        parser.add_argument('--once', action='store_true', help='Run whatever is due now and exit')
+        parser.add_argument('--run', metavar='JOB', help='Make JOB due now, then run only it (unless another replica is)')
+        parser.add_argument('--list', action='store_true', help='Show jobs, their next run and last duration')
+
+    def handle(self, *args, **options):
+        runner.sync_jobs()
+
+        if options['list']:
+            for job in Job.objects.all():
+                last = job.runs.first()
+                last_run = f"last {last.status} in {last.duration}" if last else "never run"
+                self.stdout.write(f"{job.name:20} {job.schedule:15} next {timezone.localtime(job.next_run_at):%Y-%m-%d %H:%M}  {last_run}")
+            return
+
+        jobs = JOBS
+        if options['run']:
+            jobs = [job for job in JOBS if job.name == options['run']]
+            if not jobs:
+                raise CommandError(f"Unknown job {options['run']!r}; choose from {', '.join(job.name for job in JOBS)}.")
+            runner.mark_due(options['run'])
+            options['once'] = True
+
+        stop = threading.Event()
+        if not options['once']:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *args: stop.set())
+            self.stdout.write(f"Scheduler {runner.RUNNER_ID} started with {len(JOBS)} jobs.")
+
+        while True:
+            close_old_connections()
+            job_runs = runner.run_due(jobs)
+            if options['run'] and not job_runs:
+                self.stdout.write(f"{options['run']} is already running on another replica.")
+            for job_run in job_runs:
+                style = self.style.SUCCESS if job_run.status == 'success' else self.style.ERROR
+                self.stdout.write(style(f"{job_run.job_id}: {job_run.status} in {job_run.duration}. {job_run.output}"))
+            if options['once'] or stop.wait(options['poll']):
+                break
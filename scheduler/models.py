@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class Job(models.Model):
+    """
+    Shared state of one scheduled job. Every scheduler process competes for
+    the lease on this row (see scheduler.runner), so each due run happens on
+    exactly one replica.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    schedule = models.CharField(max_length=100, help_text="Cron expression the next run was computed from")
+    next_run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class JobRun(models.Model):
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='runs')
+    runner = models.CharField(max_length=100)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='running')
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.DurationField(null=True, blank=True)
+    output = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['job', '-started_at'], name='jobrun_job_started_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} at {self.started_at} ({self.status})"
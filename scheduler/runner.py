@@ -0,0 +1,86 @@
+"""
+Leader election for scheduled jobs.
+
+Every scheduler process runs the same loop. A due job is claimed with one
+conditional UPDATE on its Job row (due, and not leased by anyone else), so
+only one replica wins each run; the others see zero rows affected and move
+on. The winner moves next_run_at forward when it finishes. If it dies
+mid-run, the lease expires and another replica picks the job up again.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .jobs import JOBS
+from .models import Job, JobRun
+
+logger = logging.getLogger(__name__)
+
+RUNNER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def sync_jobs(jobs=JOBS):
+    """Create rows for new jobs and reschedule those whose cron expression changed."""
+    now = timezone.now()
+    Job.objects.bulk_create([
+        Job(name=job.name, schedule=job.schedule, next_run_at=job.cron.next_after(now))
+        for job in jobs
+    ], ignore_conflicts=True)
+    for job in jobs:
+        Job.objects.filter(name=job.name).exclude(schedule=job.schedule).update(
+            schedule=job.schedule, next_run_at=job.cron.next_after(now)
+        )
+
+
+def acquire(job, now, runner=RUNNER_ID):
+    """Take the lease on a due job. Returns True if this runner won it."""
+    return Job.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        name=job.name,
+        next_run_at__lte=now,
+    ).update(locked_by=runner, locked_until=now + job.lease) == 1
+
+
+def release(job, runner=RUNNER_ID):
+    Job.objects.filter(name=job.name, locked_by=runner).update(
+        locked_by='', locked_until=None, next_run_at=job.cron.next_after(timezone.now())
+    )
+
+
+def run(job, runner=RUNNER_ID):
+    """Run a job whose lease this runner holds, recording the run."""
+    job_run = JobRun.objects.create(job_id=job.name, runner=runner, started_at=timezone.now())
+    start = time.monotonic()
+    try:
+        job_run.output = job.func() or ''
+        job_run.status = 'success'
+    except Exception:
+        logger.exception("Scheduled job %s failed", job.name)
+        job_run.output = traceback.format_exc()
+        job_run.status = 'failed'
+    finally:
+        job_run.duration = timedelta(seconds=time.monotonic() - start)
+        job_run.finished_at = timezone.now()
+        job_run.save(update_fields=['output', 'status', 'duration', 'finished_at'])
+        release(job, runner)
+    return job_run
+
+
+def run_due(jobs=JOBS, runner=RUNNER_ID):
+    """Run every due job this runner can claim. Returns the JobRuns."""
+    runs = []
+    for job in jobs:
+        if acquire(job, timezone.now(), runner):
+            runs.append(run(job, runner))
+    return runs
+
+
+def mark_due(name):
+    """Make a job due now (the next scheduler tick runs it, on one replica)."""
+    return Job.objects.filter(name=name).update(next_run_at=timezone.now()) == 1
@@ -0,0 +1,159 @@
+"""
+Two-tier application cache.
+
+The shared tier is Django's default cache (locmem, file or Redis, see
+CACHE_BACKEND in settings). In front of it every process keeps a small LRU
+so hot entries skip the network round trip and the unpickling on the shared
+backend.
+
+Keys are namespaced and versioned: Namespace('availability').key('x',
+scope=3) embeds the namespace version and the version of scope 3. Bumping a
+version (invalidate()) makes every key built from it unreachable in every
+process at once, so the local tier never needs to be told about
+invalidations. Versions are always read from the shared tier, so when that
+tier is per process and there are several workers (CACHE_SHARED is False)
+namespaces don't cache at all: every lookup is a miss and compute() runs.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULT_TIMEOUT = 60 * 60
+
+
+class LocalLRU:
+    """Thread-safe, size- and age-bounded in-process cache of pickled values."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, blob = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+        # Unpickle a fresh copy so callers can't mutate each other's results
+        return pickle.loads(blob)
+
+    def set(self, key, value, timeout):
+        if self.max_entries <= 0:
+            return
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = time.monotonic() + min(timeout or self.timeout, self.timeout)
+        with self._lock:
+            self._data[key] = (expires, blob)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local = LocalLRU(
+    getattr(settings, 'LOCAL_CACHE_MAX_ENTRIES', 0),
+    getattr(settings, 'LOCAL_CACHE_TIMEOUT', 60),
+)
+
+
+class Namespace:
+    """
+    A group of cache entries that can be invalidated together, either all
+    at once or one scope (e.g. one facility or one user) at a time.
+    """
+
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'CACHE_SHARED', True)
+
+    def _version_key(self, scope=None):
+        if scope is None:
+            return f'{self.name}:version'
+        return f'{self.name}:version:{scope}'
+
+    def _versions(self, scope=None):
+        keys = [self._version_key()]
+        if scope is not None:
+            keys.append(self._version_key(scope))
+        found = cache.get_many(keys)
+        for version_key in keys:
+            if version_key not in found:
+                # Start from a timestamp, not 0, so an evicted version can
+                # never come back as one that older keys were built with
+                cache.add(version_key, time.time_ns(), None)
+                found[version_key] = cache.get(version_key)
+        return [found[version_key] for version_key in keys]
+
+    def key(self, key, scope=None):
+        """The full versioned cache key for `key` (within `scope`, if given)."""
+        versions = ':'.join(str(v) for v in self._versions(scope))
+        return f'{self.name}:{versions}:{key}'
+
+    def get(self, key, default=None, scope=None):
+        if not self.enabled:
+            return default
+        return _get(self.key(key, scope), default)
+
+    def set(self, key, value, scope=None, timeout=None):
+        if self.enabled:
+            _set(self.key(key, scope), value, timeout or self.timeout)
+
+    def get_or_set(self, key, compute, scope=None, timeout=None):
+        """
+        Return the cached value, or call compute() and cache its result.
+        The key is fixed before compute() runs, so an invalidation that lands
+        while it runs still wins.
+        """
+        if not self.enabled:
+            return compute()
+        full_key = self.key(key, scope)
+        missing = object()
+        value = _get(full_key, missing)
+        if value is missing:
+            value = compute()
+            _set(full_key, value, timeout or self.timeout)
+        return value
+
+    def invalidate(self, scope=None):
+        """Drop every entry in the namespace, or just those of one scope."""
+        version_key = self._version_key(scope)
+        cache.add(version_key, time.time_ns(), None)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(version_key, time.time_ns(), None)
+
+
+def _get(full_key, default):
+    missing = object()
+    value = local.get(full_key, missing)
+    if value is not missing:
+        return value
+    value = cache.get(full_key, missing)
+    if value is missing:
+        return default
+    local.set(full_key, value, None)
+    return value
+
+
+def _set(full_key, value, timeout):
+    cache.set(full_key, value, timeout)
+    local.set(full_key, value, timeout)
@@ -0,0 +1,180 @@
+"""
+Responsive image variants.
+
+When an image is uploaded, generate_variants() writes resized copies at a
+few widths, in AVIF and WebP (where this Pillow build can encode them) plus
+a JPEG/PNG fallback. What was written is recorded in a JSON field next to the
+image, so templates can build srcset attributes without storage lookups:
+
+    {
+        "source": "gallery/court.jpg",
+        "width": 1920, "height": 1080,
+        "formats": {"webp": [[320, "gallery/variants/court.jpg-320w.webp"], ...], ...}
+    }
+
+Variants are keyed on the source name, so re-uploading an image (which
+changes its name) regenerates them, and reprocessing is a no-op otherwise.
+Variant paths embed the whole source file name, extension included, so
+court.jpg and court.png never share (or overwrite) each other's variants.
+Saves queue the work with process_on_commit(); images whose variants are
+still stale (e.g. after a failure) are picked up by generate_image_variants.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 1280)
+
+# Most compact first: <picture> sources are tried in order
+MODERN_FORMATS = ('avif', 'webp')
+
+SAVE_OPTIONS = {
+    'avif': {'quality': 60},
+    'webp': {'quality': 80, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'optimize': True},
+}
+
+
+def supported_formats():
+    """Modern formats this Pillow build can write (AVIF needs Pillow 11.3+ with libavif)."""
+    Image.init()
+    return [fmt for fmt in MODERN_FORMATS if fmt.upper() in Image.SAVE]
+
+
+def variant_name(name, width, fmt):
+    directory, filename = os.path.split(name)
+    return os.path.join(directory, 'variants', f'{filename}-{width}w.{fmt}')
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, fmt.upper(), **SAVE_OPTIONS[fmt])
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(fieldfile):
+    """Write all variants for an image field file and return the manifest."""
+    storage = fieldfile.storage
+    with fieldfile.open('rb') as handle:
+        source = Image.open(handle)
+        source = ImageOps.exif_transpose(source)
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if source.has_transparency_data else 'RGB')
+    fallback = 'png' if source.mode == 'RGBA' else 'jpeg'
+
+    # Never upscale; an image narrower than the smallest width gets one variant at its own size
+    widths = [w for w in WIDTHS if w < source.width] or [source.width]
+
+    manifest = {
+        'source': fieldfile.name,
+        'width': source.width,
+        'height': source.height,
+        'formats': {},
+    }
+    for width in widths:
+        height = max(1, round(source.height * width / source.width))
+        resized = source.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in supported_formats() + [fallback]:
+            name = variant_name(fieldfile.name, width, fmt)
+            # Only this source maps to this path: anything there is a
+            # previous run's output for the same image
+            if storage.exists(name):
+                storage.delete(name)
+            saved = storage.save(name, _encode(resized, fmt))
+            manifest['formats'].setdefault(fmt, []).append([width, saved])
+    return manifest
+
+
+def _names(manifest):
+    return {
+        name
+        for variants in (manifest or {}).get('formats', {}).values()
+        for _, name in variants
+    }
+
+
+def _owned_names(manifest):
+    """
+    Names in the manifest that only its source can have written. Variants
+    from before paths carried the extension (court-320w.webp) may be shared
+    with another image, so they are left alone.
+    """
+    source = (manifest or {}).get('source')
+    return {
+        name
+        for fmt, variants in (manifest or {}).get('formats', {}).items()
+        for width, name in variants
+        if source and name == variant_name(source, width, fmt)
+    }
+
+
+def delete_variants(manifest, storage, keep=None):
+    for name in _owned_names(manifest) - (keep or set()):
+        storage.delete(name)
+
+
+def is_stale(fieldfile, manifest):
+    """True if the variants don't match the current image (or the image was removed)."""
+    if not fieldfile:
+        return bool(manifest)
+    return (manifest or {}).get('source') != fieldfile.name
+
+
+def process(instance, field_name, manifest_field, force=False):
+    """
+    (Re)generate variants for instance.<field_name> if they are missing or
+    stale and store the manifest in instance.<manifest_field>. Saves with a
+    queryset update so post_save handlers don't run again. Returns True if
+    anything changed.
+    """
+    fieldfile = getattr(instance, field_name)
+    old = getattr(instance, manifest_field)
+    if not (force or is_stale(fieldfile, old)):
+        return False
+    if not fieldfile:
+        delete_variants(old, fieldfile.storage)
+        type(instance).objects.filter(pk=instance.pk).update(**{manifest_field: {}})
+        setattr(instance, manifest_field, {})
+        return True
+    manifest = generate_variants(fieldfile)
+    if old:
+        # Same source, same variant names: keep whatever was just rewritten
+        delete_variants(old, fieldfile.storage, keep=_names(manifest))
+    type(instance).objects.filter(pk=instance.pk).update(**{manifest_field: manifest})
+    setattr(instance, manifest_field, manifest)
+    return True
+
+
+def process_on_commit(instance, field_name, manifest_field, then=None):
+    """
+    Run process() once the current transaction commits (so the upload is
+    saved whatever happens), calling then() if anything changed. A failure is
+    logged rather than raised into the request; the variants stay stale and
+    the generate_image_variants command (run by the scheduler) retries them.
+    """
+    def run():
+        try:
+            if process(instance, field_name, manifest_field) and then:
+                then()
+        except Exception:
+            logger.exception(
+                "Generating %s variants for %s %s failed", field_name, type(instance).__name__, instance.pk
+            )
+    transaction.on_commit(run)
+
+
+def srcset(manifest, fmt):
+    """'url 320w, url 640w' for one format of a manifest, or ''."""
+    variants = (manifest or {}).get('formats', {}).get(fmt, [])
+    return ', '.join(f'{default_storage.url(name)} {width}w' for width, name in variants)
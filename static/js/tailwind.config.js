@@ -0,0 +1,28 @@
+// Tailwind Play CDN config; loaded right after cdn.tailwindcss.com in base.html
+tailwind.config = {
+  darkMode: 'class',
+  theme: {
+    extend: {
+      fontFamily: {
+        sans: ['Inter', 'sans-serif'],
+      },
+      colors: {
+        primary: '#0066FF',
+        secondary: '#00CC88',
+        dark: '#0F172A',
+        light: '#F8FAFC',
+        energy: '#FF3B30',
+      },
+      animation: {
+        'fade-in-up': 'fadeInUp 0.8s cubic-bezier(0.16, 1, 0.3, 1) forwards',
+        'spin-slow': 'spin 3s linear infinite',
+      },
+      keyframes: {
+        fadeInUp: {
+          '0%': { opacity: '0', transform: 'translateY(20px)' },
+          '100%': { opacity: '1', transform: 'translateY(0)' },
+        }
+      }
+    }
+  }
+}
@@ -1,47 +1,130 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from facilities.models import Booking, Facility
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from facilities.models import Booking
+from facilities import catalogue
+from facilities.reservations import activate_booking, deactivate_booking, bulk_activate, bulk_deactivate
+from payments.reports import revenue_summary, revenue_total
 
 def is_admin(user):
     return user.is_staff
 
+DASHBOARD_PAGE_SIZE = 25
+
 @user_passes_test(is_admin)
 def admin_dashboard(request):
     from users.models import User
     
-    # Metrics
-    active_bookings_list = Booking.objects.filter(status='active').order_by('-booking_date', 'slot__start_time')
-    total_bookings = Booking.objects.count()
-    active_bookings = Booking.objects.filter(status='active').count()
-    facilities = Facility.objects.all()
-    total_users = User.objects.count()
+    # Metrics: users LEFT JOIN bookings, counted in one query
+    metrics = User.objects.aggregate(
+        total_users=Count('id', distinct=True),
+        total_bookings=Count('bookings'),
+        active_bookings=Count('bookings', filter=Q(bookings__status='active')),
+    )
+    facility_count = len(catalogue.all_facilities())
+    
+    active_bookings_list = Booking.objects.filter(status='active').select_related(
+        'user__category', 'facility', 'slot'
+    ).only(
+        'id', 'booking_date',
+        'user__full_name', 'user__category__name',
+        'facility__facility_name',
+        'slot__start_time', 'slot__end_time', 'slot__session',
+    ).order_by('-booking_date', 'slot__start_time', 'id')
     
-    # Revenue calculation (count active bookings as placeholder for now)
-    # TODO: Add proper revenue tracking based on FacilityPricing
-    total_revenue = active_bookings * 500  # Placeholder calculation
+    paginator = Paginator(active_bookings_list, DASHBOARD_PAGE_SIZE)
+    paginator.count = metrics['active_bookings']  # Already counted above
+    page = paginator.get_page(request.GET.get('page'))
+    
+    total_revenue = revenue_total()
     
     return render(request, 'admin/dashboard.html', {
-        'active_bookings_list': active_bookings_list,
-        'facilities': facilities,
-        'total_bookings': total_bookings,
-        'active_bookings': active_bookings,
-        'total_users': total_users,
+        'active_bookings_list': page,
+        'facility_count': facility_count,
+        'total_bookings': metrics['total_bookings'],
+        'active_bookings': metrics['active_bookings'],
+        'total_users': metrics['total_users'],
         'total_revenue': total_revenue,
     })
 
+@user_passes_test(is_admin)
+def revenue_report(request):
+    """Revenue by day, facility, category and payment type for ?from=&to= (YYYY-MM-DD)"""
+    from datetime import datetime
+    
+    try:
+        start = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else None
+        end = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else None
+    except ValueError:
+        return JsonResponse({'error': "Dates must be in YYYY-MM-DD format."}, status=400)
+    
+    return JsonResponse(revenue_summary(start, end))
+
 @user_passes_test(is_admin)
 def approve_booking(request, booking_id):
-    booking = get_object_or_404(Booking, id=booking_id)
-    booking.status = 'active'
-    booking.save()
+    booking = get_object_or_404(Booking.objects.select_related('facility', 'slot', 'user'), id=booking_id)
+    try:
+        activate_booking(booking)
+    except ValidationError as e:
+        messages.error(request, f"Booking #{booking.id} could not be approved: {e.message}")
+        return redirect('users:admin_dashboard')
     messages.success(request, f"Booking #{booking.id} Approved!")
     return redirect('users:admin_dashboard')
 
 @user_passes_test(is_admin)
 def reject_booking(request, booking_id):
-    booking = get_object_or_404(Booking, id=booking_id)
-    booking.status = 'cancelled'
-    booking.save()
+    booking = get_object_or_404(Booking.objects.select_related('user'), id=booking_id)
+    deactivate_booking(booking)
     messages.warning(request, f"Booking #{booking.id} Rejected.")
     return redirect('users:admin_dashboard')
+
+@user_passes_test(is_admin)
+@require_POST
+def bulk_update_bookings(request):
+    """
+    Approve or reject many bookings at once.
+    POST action=approve|reject and either ids (repeated or comma-separated)
+    or a filter: status (default pending), facility, date (YYYY-MM-DD).
+    Returns a per-ID JSON report.
+    """
+    from datetime import datetime
+    
+    action = request.POST.get('action')
+    if action not in ('approve', 'reject'):
+        return JsonResponse({'error': "action must be 'approve' or 'reject'."}, status=400)
+    
+    try:
+        ids = [int(i) for value in request.POST.getlist('ids') for i in value.split(',') if i.strip()]
+        if ids:
+            bookings = Booking.objects.filter(pk__in=ids)
+        else:
+            bookings = Booking.objects.filter(status=request.POST.get('status') or 'pending')
+            if request.POST.get('facility'):
+                bookings = bookings.filter(facility_id=int(request.POST['facility']))
+            if request.POST.get('date'):
+                bookings = bookings.filter(booking_date=datetime.strptime(request.POST['date'], '%Y-%m-%d').date())
+    except ValueError:
+        return JsonResponse({'error': "ids and facility must be integers, date YYYY-MM-DD."}, status=400)
+    
+    if action == 'approve':
+        results = bulk_activate(bookings)
+    else:
+        results = bulk_deactivate(bookings)
+    
+    for missing_id in set(ids) - set(results):
+        results[missing_id] = ('not_found', "No such booking.")
+    
+    summary = {}
+    for outcome, _ in results.values():
+        summary[outcome] = summary.get(outcome, 0) + 1
+    
+    return JsonResponse({
+        'action': action,
+        'summary': summary,
+        'results': {str(b_id): {'outcome': outcome, 'message': message} for b_id, (outcome, message) in sorted(results.items())},
+    })
@@ -0,0 +1,95 @@
+import time
+from copy import copy
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.engine import Engine
+from django.test import Client
+from django.test.signals import template_rendered
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from facilities import catalogue
+from users.models import User
+
+# (page, who requests it); the page's top-level template is what gets timed
+PAGES = [
+    ('/', 'anonymous'),
+    ('/tariff/', 'user'),
+    ('/facilities/', 'user'),
+    ('/facilities/book/{facility_id}/', 'user'),
+    ('/facilities/calendar/', 'user'),
+    ('/facilities/my-bookings/', 'user'),
+    ('/facilities/gallery/', 'anonymous'),
+    ('/users/dashboard/', 'user'),
+    ('/users/profile/', 'user'),
+    ('/users/custom-admin/', 'staff'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Time rendering of the main templates with their real view context, cached vs. parsed from disk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100, help='Renders per template (default: 100)')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        contexts = self.capture_contexts()
+
+        cached = engines['django'].engine
+        # Same configuration, but every get_template() reads and parses the file again
+        uncached = Engine(
+            dirs=cached.dirs,
+            context_processors=cached.context_processors,
+            debug=cached.debug,
+            loaders=['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader'],
+            libraries=cached.libraries,
+            builtins=cached.builtins,
+        )
+
+        self.stdout.write(f"{'template':40} {'cached ms':>10} {'uncached ms':>12}  (mean of {iterations}, debug={cached.debug})")
+        for name, context in contexts:
+            timings = [self.time_render(engine, name, context, iterations) for engine in (cached, uncached)]
+            self.stdout.write(f"{name:40} {timings[0]:10.2f} {timings[1]:12.2f}")
+
+    def capture_contexts(self):
+        user = User.objects.filter(status='approved', is_staff=False).first()
+        staff = User.objects.filter(is_staff=True).first()
+        facility = next(iter(catalogue.active_facilities()), None)
+        if not (user and staff and facility):
+            raise CommandError('Need an approved user, a staff user and an active facility to benchmark with.')
+
+        clients = {'anonymous': Client(), 'user': Client(), 'staff': Client()}
+        clients['user'].force_login(user)
+        clients['staff'].force_login(staff)
+
+        captured = []
+
+        def capture(sender, template, context, **kwargs):
+            captured.append((template.name, copy(context)))
+
+        contexts = []
+        setup_test_environment()
+        template_rendered.connect(capture)
+        try:
+            for url, who in PAGES:
+                captured.clear()
+                response = clients[who].get(url.format(facility_id=facility.id))
+                if response.status_code != 200 or not captured:
+                    self.stderr.write(f'Skipping {url}: status {response.status_code}')
+                    continue
+                # The first template rendered is the page itself; the rest are its parents and includes
+                contexts.append(captured[0])
+        finally:
+            template_rendered.disconnect(capture)
+            teardown_test_environment()
+        return contexts
+
+    def time_render(self, engine, name, context, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            template = engine.get_template(name)
+            render_context = copy(context)
+            render_context.template = None
+            template.render(render_context)
+        return (time.perf_counter() - start) * 1000 / iterations
@@ -1,27 +1,36 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from users.models import User, Membership, Category
-from datetime import date
+from users.models import User
+
+# Rows per UPDATE/transaction, so no single statement holds its locks for the whole run
+CHUNK_SIZE = 5000
 
 class Command(BaseCommand):
     help = 'Process student lifecycle: promote school students, expire college students'
 
     def add_arguments(self, parser):
         parser.add_argument('--force', action='store_true', help='Force promotion even if not April 30')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many students would change')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help=f'Rows per transaction (default: {CHUNK_SIZE})')
 
     def handle(self, *args, **options):
         today = timezone.now().date()
-        self.stdout.write(f"Processing student lifecycle for {today}...")
+        self.dry_run = options['dry_run']
+        self.chunk_size = options['chunk_size']
+        self.verbosity = options['verbosity']
+        self.stdout.write(f"Processing student lifecycle for {today}{' (dry run)' if self.dry_run else ''}...")
 
         is_promotion_day = (today.month == 4 and today.day == 30)
-        
+
         if is_promotion_day or options['force']:
             self.promote_school_students()
         else:
             self.stdout.write("Not promotion day (April 30). Skipping auto-promotion.")
 
         # 2. Check for expiry (College & School Class 12 completion)
-        self.check_student_expiry()
+        self.check_student_expiry(today)
 
     def promote_school_students(self):
         """
@@ -29,22 +38,22 @@ class Command(BaseCommand):
         If class > 12, they graduate to Normal User.
         """
         school_students = User.objects.filter(
-            is_student=True, 
-            student_type='school', 
+            is_student=True,
+            student_type='school',
             status='approved'
         )
-        
-        for student in school_students:
-            if student.current_class:
-                if student.current_class < 12:
-                    student.current_class += 1
-                    student.save()
-                    self.stdout.write(f"Promoted {student.username} to class {student.current_class}")
-                else:
-                    # Completed Class 12
-                    self.convert_to_individual(student, reason="Completed Class 12")
+        # Graduate first, so this year's class 11 -> 12 promotions aren't graduated in the same run
+        graduated = self.convert_to_individual(
+            school_students.filter(current_class__gte=12), reason="Completed Class 12"
+        )
+        promoted = self.apply(
+            school_students.filter(current_class__lt=12),
+            current_class=F('current_class') + 1,
+        )
+        self.stdout.write(f"{self.verb('Promoted')} {promoted} school students to the next class.")
+        self.stdout.write(f"{self.verb('Graduated')} {graduated} school students after Class 12.")
 
-    def check_student_expiry(self):
+    def check_student_expiry(self, today):
         """
         Check if course ended (College) or if manually processed expiry is needed
         """
@@ -53,22 +62,40 @@ class Command(BaseCommand):
             is_student=True,
             student_type='college',
             status='approved',
-            course_end_date__lt=timezone.now().date()
+            course_end_date__lt=today
         )
-        
-        for student in expired_college_students:
-            self.convert_to_individual(student, reason=f"Course ended on {student.course_end_date}")
+        expired = self.convert_to_individual(expired_college_students, reason="Course ended")
+        self.stdout.write(f"{self.verb('Converted')} {expired} college students whose course has ended.")
 
-    def convert_to_individual(self, user, reason):
+    def convert_to_individual(self, users, reason):
         """
-        Downgrades a student to individual status
+        Downgrades students to individual status
         """
-        self.stdout.write(f"Converting {user.username} to Individual. Reason: {reason}")
-        user.is_student = False
-        user.student_type = None
-        user.current_class = None
-        user.save()
-        
-        # We might want to deactivate their student membership if strict, 
+        # We might want to deactivate their student membership if strict,
         # but requirements say: "If the membership is going on , keep it active but the next membership should show price of normal user membership."
         # So we just change their user status so next time they buy, they see individual prices.
+        return self.apply(users, reason=reason, is_student=False, student_type=None, current_class=None)
+
+    def apply(self, queryset, reason=None, **changes):
+        """
+        Run queryset.update(**changes) in chunks of primary keys, one transaction
+        each. The filter is re-applied per chunk, so rows that stopped matching
+        since the ids were read are left alone. Returns the number of rows updated
+        (or that would be, with --dry-run).
+        """
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        if self.verbosity >= 2:
+            for username in queryset.values_list('username', flat=True):
+                self.stdout.write(f"  {username}" + (f": {reason}" if reason else ""))
+        if self.dry_run:
+            return len(ids)
+
+        updated = 0
+        for start in range(0, len(ids), self.chunk_size):
+            chunk = ids[start:start + self.chunk_size]
+            with transaction.atomic():
+                updated += queryset.filter(pk__gte=chunk[0], pk__lte=chunk[-1]).update(**changes)
+        return updated
+
+    def verb(self, past_tense):
+        return 'Would have ' + past_tense.lower() if self.dry_run else past_tense
@@ -0,0 +1,71 @@
+"""
+Per-user membership lookup shared by every view.
+
+The active membership (with its tier and category) is cached per user, so
+most requests never query for it. Saving or deleting a Membership drops the
+user's entry; editing a tier or category drops everyone's.
+MembershipMiddleware exposes the result lazily as request.membership, so
+requests that never look at it cost nothing. Decisions that write (booking,
+buying a membership) ask for fresh=True and read the database instead.
+"""
+from django.utils.functional import SimpleLazyObject
+
+from sports_management_system.caching import Namespace
+
+from .models import Membership
+
+CACHE_TIMEOUT = 60 * 60
+
+MEMBERSHIPS = Namespace('membership', timeout=CACHE_TIMEOUT)
+
+# Cached in place of None so "no membership" is a cache hit too
+NO_MEMBERSHIP = 'none'
+
+DURATION_LABELS = {1: '30 Days', 6: '6 Months', 12: '1 Year'}
+PLAN_LABELS = {1: 'Monthly Plan', 6: 'Half-Yearly Plan', 12: 'Yearly Plan'}
+
+
+def duration_label(months):
+    """Tariff wording: '30 Days', '6 Months', '1 Year'."""
+    return DURATION_LABELS.get(months, f'{months} Months')
+
+
+def plan_label(months):
+    """Dashboard/profile wording: 'Monthly Plan', 'Half-Yearly Plan', 'Yearly Plan'."""
+    return PLAN_LABELS.get(months, f'{months} Months Plan')
+
+
+def _load(user_id):
+    return Membership.objects.filter(
+        user_id=user_id,
+        is_active=True
+    ).select_related('membership_tier__category').first() or NO_MEMBERSHIP
+
+
+def get_active_membership(user, fresh=False):
+    """The user's most recent active membership, or None; fresh=True skips the cache."""
+    if not user.is_authenticated:
+        return None
+    if fresh:
+        membership = _load(user.pk)
+    else:
+        membership = MEMBERSHIPS.get_or_set('active', lambda: _load(user.pk), scope=user.pk)
+    if membership == NO_MEMBERSHIP:
+        return None
+    return membership
+
+
+def invalidate(user_id=None):
+    """Drop one user's cached membership, or everyone's."""
+    MEMBERSHIPS.invalidate(scope=user_id)
+
+
+class MembershipMiddleware:
+    """Adds request.membership, resolved on first access. Must follow AuthenticationMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.membership = SimpleLazyObject(lambda: get_active_membership(request.user))
+        return self.get_response(request)
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser
 
 class Category(models.Model):
@@ -116,6 +119,8 @@ class User(AbstractUser):
     # Files
     student_id_proof = models.ImageField(upload_to='student_ids/', null=True, blank=True)
     photo = models.ImageField(upload_to='user_photos/', null=True, blank=True)
+    # Resized/WebP/AVIF copies of photo, see sports_management_system/images.py
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Extras
     sports_discipline = models.CharField(max_length=50, choices=SPORTS_DISCIPLINE_CHOICES, default='Others')
@@ -140,3 +145,30 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.username} ({self.status})"
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+@receiver(post_save, sender=MembershipTier)
+@receiver(post_save, sender=Category)
+def invalidate_membership_cache(sender, instance, **kwargs):
+    from .memberships import invalidate
+    # Tier and category edits change every cached membership that embeds them
+    user_id = instance.user_id if sender is Membership else None
+    transaction.on_commit(lambda: invalidate(user_id))
+
+
+@receiver(post_save, sender=MembershipTier)
+@receiver(post_delete, sender=MembershipTier)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_tariff_cache(sender, instance, **kwargs):
+    from .tariff import invalidate
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=User)
+def generate_photo_variants(sender, instance, **kwargs):
+    from sports_management_system import images
+    if images.is_stale(instance.photo, instance.photo_variants):
+        images.process_on_commit(instance, 'photo', 'photo_variants')
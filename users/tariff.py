@@ -0,0 +1,69 @@
+"""
+Cached membership pricing tables.
+
+The tier tables are loaded once and cached until a MembershipTier or
+Category changes. Per-user state (login/active/upgrade/purchase) is laid over
+a fresh copy on every request. Anonymous visitors all see the same page, so
+the rendered HTML itself is cached in the same namespace.
+"""
+from sports_management_system.caching import Namespace
+
+from .memberships import duration_label
+from .models import Category, MembershipTier
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+TARIFF = Namespace('tariff', timeout=CACHE_TIMEOUT)
+
+# Context name and duration of each pricing table
+TIER_GROUPS = [
+    ('monthly_tiers', 1),
+    ('half_yearly_tiers', 6),
+    ('yearly_tiers', 12),
+]
+
+ANONYMOUS_PAGE_KEY = 'page:anonymous'
+
+
+def _load_tables():
+    tables = {'categories': list(Category.objects.all().order_by('-priority'))}
+    tiers = MembershipTier.objects.filter(
+        duration_months__in=[months for _, months in TIER_GROUPS],
+        is_active=True
+    ).select_related('category').order_by('category__priority')
+    tables.update({name: [] for name, _ in TIER_GROUPS})
+    by_duration = {months: name for name, months in TIER_GROUPS}
+    for tier in tiers:
+        tier.display_duration = duration_label(tier.duration_months)
+        tables[by_duration[tier.duration_months]].append(tier)
+    return tables
+
+
+def get_tables():
+    """Categories and tier tables, keyed by template context name."""
+    return TARIFF.get_or_set('tables', _load_tables)
+
+
+def tier_status(tier, active_membership, authenticated):
+    """What the user can do with a tier: login, active, upgrade, purchase or none."""
+    if not authenticated:
+        return 'login'
+    if not active_membership:
+        return 'purchase'
+    current = active_membership.membership_tier
+    if current.id == tier.id:
+        return 'active'
+    if tier.duration_months > current.duration_months or (
+        tier.duration_months == current.duration_months and tier.base_price > current.base_price
+    ):
+        return 'upgrade'
+    return 'none'
+
+
+def anonymous_page(render_page):
+    """Rendered tariff page for anonymous visitors; render_page() builds it on a miss."""
+    return TARIFF.get_or_set(ANONYMOUS_PAGE_KEY, render_page)
+
+
+def invalidate():
+    TARIFF.invalidate()
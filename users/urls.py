@@ -16,8 +16,10 @@ urlpatterns = [
     
     # Custom Admin Routes
     path('custom-admin/', admin_views.admin_dashboard, name='admin_dashboard'),
+    path('custom-admin/revenue/', admin_views.revenue_report, name='revenue_report'),
     path('custom-admin/approve/<int:booking_id>/', admin_views.approve_booking, name='approve_booking'),
     path('custom-admin/reject/<int:booking_id>/', admin_views.reject_booking, name='reject_booking'),
+    path('custom-admin/bookings/bulk/', admin_views.bulk_update_bookings, name='bulk_update_bookings'),
     
     # Password & Security
     path('forgot-password/', views.forgot_password_view, name='forgot_password'),
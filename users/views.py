@@ -1,11 +1,14 @@
 from django.shortcuts import render, redirect
+from django.http import HttpResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.utils import timezone
 from .forms import UserRegistrationForm, UserLoginForm
 from .models import User
-from facilities.models import Facility, FacilityPricing, Category
+from .memberships import duration_label, get_active_membership, plan_label
+from . import tariff
+from facilities import catalogue
 
 def home_view(request):
     """Public Landing Page"""
@@ -13,75 +16,36 @@ def home_view(request):
     if request.user.is_authenticated:
         return redirect('users:dashboard')
     
-    featured_facilities = Facility.objects.all()[:4] # Show top 4
+    featured_facilities = catalogue.all_facilities()[:4] # Show top 4
     return render(request, 'home.html', {'featured_facilities': featured_facilities})
 
 def tariff_view(request):
     """Membership Pricing Table"""
-    from .models import MembershipTier
-    
-    categories = Category.objects.all().order_by('-priority')
-    
-    # Get user's active membership if authenticated
-    active_membership = None
-    if request.user.is_authenticated:
-        from .models import Membership
-        active_membership = Membership.objects.filter(
-            user=request.user,
-            is_active=True,
-            end_date__gte=timezone.now().date()
-        ).select_related('membership_tier').first()
+    if not request.user.is_authenticated and not len(messages.get_messages(request)):
+        # Same page for every anonymous visitor (unless there are messages to show)
+        page = tariff.anonymous_page(lambda: _render_tariff(request).content)
+        return HttpResponse(page)
+    return _render_tariff(request)
 
-        if active_membership:
-             # Formatted duration for the active plan card
-            months = active_membership.membership_tier.duration_months
-            if months == 1:
-                active_membership.membership_tier.display_duration = "30 Days"
-            elif months == 6:
-                active_membership.membership_tier.display_duration = "6 Months"
-            elif months == 12:
-                active_membership.membership_tier.display_duration = "1 Year"
-            else:
-                active_membership.membership_tier.display_duration = f"{months} Months"
+def _render_tariff(request):
+    context = tariff.get_tables()
     
-    # Group membership tiers by duration and annotate with status
-    def annotate_tiers(tiers, active_mem):
-        result = []
-        for tier in tiers:
-            # Set display duration text
-            if tier.duration_months == 1:
-                tier.display_duration = "30 Days"
-            elif tier.duration_months == 6:
-                tier.display_duration = "6 Months"
-            elif tier.duration_months == 12:
-                tier.display_duration = "1 Year"
-            else:
-                tier.display_duration = f"{tier.duration_months} Months"
-
-            if not request.user.is_authenticated:
-                tier.status = 'login'
-            elif active_mem and active_mem.membership_tier.id == tier.id:
-                tier.status = 'active'
-            elif active_mem and (tier.duration_months > active_mem.membership_tier.duration_months or (tier.duration_months == active_mem.membership_tier.duration_months and tier.base_price > active_mem.membership_tier.base_price)):
-                tier.status = 'upgrade'
-            elif not active_mem:
-                tier.status = 'purchase'
-            else:
-                tier.status = 'none'
-            result.append(tier)
-        return result
+    # Get user's active membership if authenticated
+    active_membership = request.membership
+    if active_membership and active_membership.end_date < timezone.now().date():
+        active_membership = None
+    if active_membership:
+        # Formatted duration for the active plan card
+        tier = active_membership.membership_tier
+        tier.display_duration = duration_label(tier.duration_months)
     
-    monthly = MembershipTier.objects.filter(duration_months=1, is_active=True).select_related('category').order_by('category__priority')
-    half_yearly = MembershipTier.objects.filter(duration_months=6, is_active=True).select_related('category').order_by('category__priority')
-    yearly = MembershipTier.objects.filter(duration_months=12, is_active=True).select_related('category').order_by('category__priority')
+    # Per-user overlay on the cached tables
+    for name, _ in tariff.TIER_GROUPS:
+        for tier in context[name]:
+            tier.status = tariff.tier_status(tier, active_membership, request.user.is_authenticated)
     
-    return render(request, 'tariff.html', {
-        'categories': categories,
-        'monthly_tiers': annotate_tiers(monthly, active_membership),
-        'half_yearly_tiers': annotate_tiers(half_yearly, active_membership),
-        'yearly_tiers': annotate_tiers(yearly, active_membership),
-        'active_membership': active_membership,
-    })
+    context['active_membership'] = active_membership
+    return render(request, 'tariff.html', context)
 
 def register_view(request):
     if request.method == 'POST':
@@ -218,24 +182,11 @@ def logout_view(request):
 def dashboard_view(request):
     """User Dashboard"""
     from facilities.models import Booking
-    from .models import Membership
-    
-    # Get active membership
-    active_membership = Membership.objects.filter(
-        user=request.user,
-        is_active=True
-    ).select_related('membership_tier').first()
     
+    active_membership = request.membership
     if active_membership:
-        months = active_membership.membership_tier.duration_months
-        if months == 1:
-            active_membership.membership_tier.display_duration = "Monthly Plan"
-        elif months == 6:
-            active_membership.membership_tier.display_duration = "Half-Yearly Plan"
-        elif months == 12:
-            active_membership.membership_tier.display_duration = "Yearly Plan"
-        else:
-            active_membership.membership_tier.display_duration = f"{months} Months Plan"
+        tier = active_membership.membership_tier
+        tier.display_duration = plan_label(tier.duration_months)
 
     # Calculate days remaining if membership exists
     days_remaining = None
@@ -245,11 +196,6 @@ def dashboard_view(request):
     
     recent_bookings = Booking.objects.filter(user=request.user).select_related('facility', 'slot').order_by('-created_at')[:5]
     
-    # Format dates for template to avoid potential rendering issues
-    valid_until = ""
-    if active_membership and active_membership.end_date:
-        valid_until = active_membership.end_date.strftime("%B %d, %Y")
-
     formatted_bookings = []
     for booking in recent_bookings:
         formatted_bookings.append({
@@ -265,7 +211,6 @@ def dashboard_view(request):
         'active_membership': active_membership,
         'days_remaining': days_remaining,
         'recent_bookings': recent_bookings,
-        'valid_until': valid_until,
         'formatted_bookings': formatted_bookings
     }
     return render(request, 'users/dashboard_v2.html', context)
@@ -285,11 +230,11 @@ def purchase_membership_view(request, tier_id):
         messages.error(request, "Invalid membership tier selected.")
         return redirect('tariff')
     
-    # Check if user already has an active membership
-    existing_membership = Membership.objects.filter(
-        user=request.user,
-        is_active=True
-    ).first()
+    # Check if user already has an active membership (from the database when buying)
+    if request.method == 'POST':
+        existing_membership = get_active_membership(request.user, fresh=True)
+    else:
+        existing_membership = request.membership
     
     if existing_membership and existing_membership.is_valid():
         messages.warning(request, f"You already have an active membership until {existing_membership.end_date}. Please wait until it expires before purchasing a new one.")
@@ -345,21 +290,12 @@ def purchase_membership_view(request, tier_id):
 @login_required
 def profile_view(request):
     """User Profile Page"""
-    from facilities.models import Booking
-    from .models import Membership
-    
-    active_membership = Membership.objects.filter(user=request.user, is_active=True).select_related('membership_tier').first()
+    from facilities.history import user_history_count
     
+    active_membership = request.membership
     if active_membership:
-        months = active_membership.membership_tier.duration_months
-        if months == 1:
-            active_membership.membership_tier.display_duration = "Monthly Plan"
-        elif months == 6:
-            active_membership.membership_tier.display_duration = "Half-Yearly Plan"
-        elif months == 12:
-            active_membership.membership_tier.display_duration = "Yearly Plan"
-        else:
-            active_membership.membership_tier.display_duration = f"{months} Months Plan"
+        tier = active_membership.membership_tier
+        tier.display_duration = plan_label(tier.duration_months)
 
     # Calculate days remaining
     days_remaining = None
@@ -367,7 +303,7 @@ def profile_view(request):
         from django.utils import timezone
         days_remaining = (active_membership.end_date - timezone.now().date()).days
 
-    total_bookings = Booking.objects.filter(user=request.user).count()
+    total_bookings = user_history_count(request.user)
     
     context = {
         'active_membership': active_membership,
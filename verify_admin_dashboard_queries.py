@@ -0,0 +1,67 @@
+import os
+import django
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from users.models import User, Category
+from facilities.models import Facility, TimeSlot, Booking
+
+def make_bookings(count, facility, slot, category):
+    """Active bookings for `count` throwaway users, one each."""
+    Booking.objects.filter(user__username__startswith='dash_user_').delete()
+    User.objects.filter(username__startswith='dash_user_').delete()
+    User.objects.bulk_create([
+        User(username=f"dash_user_{i}", email=f"dash_{i}@test.com", phone_number=f"7{i:09d}",
+             full_name=f"Dash User {i}", status='approved', category=category)
+        for i in range(count)
+    ])
+    day = timezone.now().date() + timedelta(days=1)
+    Booking.objects.bulk_create([
+        Booking(user=user, facility=facility, slot=slot, session=slot.session, booking_date=day, status='active')
+        for user in User.objects.filter(username__startswith='dash_user_')
+    ])
+
+@override_settings(ALLOWED_HOSTS=['*', 'testserver'])
+def verify_dashboard_queries():
+    print("Verifying admin dashboard query count...")
+
+    admin, _ = User.objects.get_or_create(username='dash_admin', defaults={
+        'email': 'dash_admin@test.com', 'phone_number': '7999999999', 'is_staff': True
+    })
+    category, _ = Category.objects.get_or_create(name='Dashboard_Test')
+    facility = Facility.objects.first()
+    slot = TimeSlot.objects.first()
+    if not (facility and slot):
+        print("FAIL: Need at least one facility and time slot.")
+        return
+
+    client = Client()
+    client.force_login(admin)
+    # Warm per-process caches (facility catalogue) so only per-request queries are counted
+    client.get('/users/custom-admin/')
+
+    counts = {}
+    for n in (5, 50):
+        make_bookings(n, facility, slot, category)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = client.get('/users/custom-admin/')
+        counts[n] = len(ctx.captured_queries)
+        print(f"  {n} bookings: status {resp.status_code}, {counts[n]} queries")
+
+    if counts[5] == counts[50]:
+        print("PASS: Query count does not grow with bookings.")
+    else:
+        print("FAIL: Query count grows with the number of bookings (N+1).")
+
+    # Cleanup
+    Booking.objects.filter(user__username__startswith='dash_user_').delete()
+    User.objects.filter(username__startswith='dash_user_').delete()
+
+if __name__ == '__main__':
+    verify_dashboard_queries()
@@ -72,11 +72,11 @@ def verify_features():
     
     booking.refresh_from_db()
     
-    if resp.status_code == 302 and 'my_bookings' in resp.url:
-         if not Booking.objects.filter(pk=booking.id).exists(): # I used booking.delete() in view
-             print("  PASS: Booking Cancelled (Deleted)")
+    if resp.status_code == 302 and 'my-bookings' in resp.url:
+         if booking.status == 'cancelled': # Soft cancel: the row stays for history
+             print("  PASS: Booking Cancelled (status 'cancelled')")
          else:
-             print(f"  FAIL: Booking still exists. Status: {booking.status}")
+             print(f"  FAIL: Booking not cancelled. Status: {booking.status}")
     else:
          print(f"  FAIL: URL {resp.url}")
 
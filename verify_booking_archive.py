@@ -0,0 +1,130 @@
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+import django
+
+# Loads synthetic booking history (rolled back afterwards) and times the booking
+# rule queries before and after archiving it:
+#   BOOKING_HISTORY_ROWS=5000000 python verify_booking_archive.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import transaction
+from django.utils import timezone
+from facilities.booking_rules import load_context
+from facilities.history import ARCHIVE_AFTER_DAYS, archive_bookings, user_history
+from facilities.models import Booking, BookingArchive, Facility, TimeSlot
+from payments.models import Payment
+from users.models import User
+from verify_query_plans import booking_rule_queries
+
+ROWS = int(os.environ.get('BOOKING_HISTORY_ROWS', 5000000))
+USERS = 2000
+DAYS = 1000  # history spread over roughly three years before the archive cutoff
+REPEAT = 50
+
+
+class Rollback(Exception):
+    pass
+
+
+def load_history(users, facilities, slots, today):
+    batch = []
+    for i in range(ROWS):
+        # Mixed radix over (user, day, slot, facility) keeps unique_together happy
+        user = users[i % USERS]
+        day = today - timedelta(days=ARCHIVE_AFTER_DAYS + 1 + (i // USERS) % DAYS)
+        slot = slots[(i // (USERS * DAYS)) % len(slots)]
+        facility = facilities[(i // (USERS * DAYS * len(slots))) % len(facilities)]
+        batch.append(Booking(
+            user_id=user, facility_id=facility, slot_id=slot.id, booking_date=day,
+            session=slot.session, status='cancelled' if i % 10 == 0 else 'completed',
+        ))
+        if len(batch) == 10000:
+            Booking.objects.bulk_create(batch)
+            batch = []
+    Booking.objects.bulk_create(batch)
+
+
+def time_queries(user, facility, slot, today):
+    now = datetime.combine(today, slot.start_time)
+    timings = {}
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        load_context(user, facility, slot, today, today, now)
+    timings['load_context (rules)'] = (time.perf_counter() - start) * 1000 / REPEAT
+    for name, queryset in booking_rule_queries(user, facility, slot, today).items():
+        if queryset.model is not Booking:
+            continue
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            list(queryset.all())
+        timings[name] = (time.perf_counter() - start) * 1000 / REPEAT
+    start = time.perf_counter()
+    for _ in range(5):
+        user_history(user)
+    timings['user history (my bookings)'] = (time.perf_counter() - start) * 1000 / 5
+    return timings
+
+
+def verify_booking_archive():
+    print(f"Verifying booking archive with {ROWS} historical bookings...")
+    facilities = list(Facility.objects.values_list('id', flat=True))
+    slots = list(TimeSlot.objects.all())
+    if not (facilities and slots):
+        print("FAIL: Need at least one facility and time slot.")
+        return
+    today = timezone.localdate()
+    try:
+        with transaction.atomic():
+            users = [u.id for u in User.objects.bulk_create([
+                User(username=f'archive-{i}', email=f'archive-{i}@example.com', phone_number=f'arc{i:09d}',
+                     full_name=f'Archive {i}', address='-', status='approved')
+                for i in range(USERS)
+            ])]
+            if not users[0]:
+                users = list(User.objects.filter(username__startswith='archive-').order_by('id').values_list('id', flat=True))
+            start = time.perf_counter()
+            load_history(users, facilities, slots, today)
+            print(f"INFO: Loaded history in {time.perf_counter() - start:.1f}s.")
+
+            user = User.objects.get(pk=users[0])
+            facility, slot = Facility.objects.get(pk=facilities[0]), slots[0]
+            Booking.objects.create(user=user, facility=facility, slot=slot, booking_date=today + timedelta(days=1), status='active')
+            paid = Booking.objects.filter(user=user).order_by('booking_date').first()
+            payment = Payment.objects.create(user=user, booking=paid, amount=100, payment_type='single_game',
+                                             payment_status='success', transaction_id=str(uuid.uuid4()))
+            history_before = [(b.id, b.status, b.booking_date, b.facility_id, b.slot_id, b.session, b.created_at) for b in user_history(user)]
+            before = time_queries(user, facility, slot, today)
+
+            start = time.perf_counter()
+            moved = archive_bookings()
+            print(f"INFO: Archived {moved} bookings in {time.perf_counter() - start:.1f}s.")
+            after = time_queries(user, facility, slot, today)
+
+            if moved == ROWS and Booking.objects.filter(user=user).count() == 1:
+                print("PASS: All finished bookings past the cutoff were archived; active ones stayed.")
+            else:
+                print(f"FAIL: Archived {moved} of {ROWS}.")
+            if [(b.id, b.status, b.booking_date, b.facility_id, b.slot_id, b.session, b.created_at) for b in user_history(user)] == history_before:
+                print("PASS: User history reads the same across both tables.")
+            else:
+                print("FAIL: User history changed after archiving.")
+            payment.refresh_from_db()
+            if payment.booking_id is None and payment.archived_booking_id == paid.id \
+                    and BookingArchive.objects.filter(pk=paid.id).exists():
+                print("PASS: Payments follow their booking into the archive.")
+            else:
+                print("FAIL: Payment lost its booking.")
+
+            print(f"{'query (mean ms)':32} {'before':>10} {'after':>10}")
+            for name in before:
+                print(f"{name:32} {before[name]:10.2f} {after[name]:10.2f}")
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    verify_booking_archive()
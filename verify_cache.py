@@ -0,0 +1,81 @@
+import os
+import django
+
+# Runs against whatever CACHE_BACKEND selects, e.g. a local Redis-compatible server:
+#   CACHE_BACKEND=redis CACHE_LOCATION=redis://127.0.0.1:6379/0 python verify_cache.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+os.environ.setdefault('LOCAL_CACHE_MAX_ENTRIES', '3')
+django.setup()
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from sports_management_system.caching import Namespace, local
+
+
+def verify_cache():
+    print(f"Verifying two-tier cache (shared backend: {settings.CACHES['default']['BACKEND']})...")
+    ns = Namespace('verify')
+    ns.invalidate()
+
+    # 1. Round trip, and None is cached like any other value
+    ns.set('a', {'x': 1})
+    ns.set('none', None)
+    calls = []
+    value = ns.get_or_set('none', lambda: calls.append(1))
+    if ns.get('a') == {'x': 1} and value is None and not calls:
+        print("PASS: Values round-trip through the cache.")
+    else:
+        print("FAIL: Cached values were not returned.")
+
+    # 2. Local tier hands out copies
+    ns.get('a')['x'] = 2
+    if ns.get('a') == {'x': 1}:
+        print("PASS: Mutating a cached value does not leak into the cache.")
+    else:
+        print("FAIL: Cached value was mutated in place.")
+
+    # 3. Scoped invalidation only drops that scope
+    ns.set('b', 'one', scope=1)
+    ns.set('b', 'two', scope=2)
+    ns.invalidate(scope=1)
+    if ns.get('b', scope=1) is None and ns.get('b', scope=2) == 'two':
+        print("PASS: Invalidating a scope leaves other scopes alone.")
+    else:
+        print("FAIL: Scoped invalidation dropped the wrong entries.")
+
+    # 4. Namespace invalidation reaches entries still held in the local tier,
+    #    as it would when another worker process bumps the version
+    ns.set('c', 'stale', scope=2)
+    full_key = ns.key('c', scope=2)
+    cache.incr(ns._version_key())
+    if local.get(full_key) == 'stale' and ns.get('c', scope=2) is None:
+        print("PASS: A version bump hides locally cached entries.")
+    else:
+        print("FAIL: Stale entry served from the local tier.")
+
+    # 5. Local tier stays within its size bound
+    for i in range(10):
+        ns.set(f'lru{i}', i)
+    if len(local._data) <= local.max_entries:
+        print(f"PASS: Local tier holds at most {local.max_entries} entries.")
+    else:
+        print(f"FAIL: Local tier grew to {len(local._data)} entries.")
+
+    # 6. With a per-process tier and several workers, nothing is cached
+    with override_settings(CACHE_SHARED=False):
+        ns.set('d', 'cached')
+        calls = []
+        ns.get_or_set('e', lambda: calls.append(1))
+        ns.get_or_set('e', lambda: calls.append(1))
+        bypassed = ns.get('d') is None and len(calls) == 2
+    if bypassed and ns.get('d') is None:
+        print("PASS: Namespaces are bypassed when the shared tier is per process.")
+    else:
+        print("FAIL: Cached despite CACHE_SHARED=False.")
+
+    ns.invalidate()
+
+
+if __name__ == '__main__':
+    verify_cache()
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from datetime import timedelta
+import django
+
+# Loads synthetic active bookings for the next 30 days (rolled back afterwards)
+# and compares the calendar payload before (one object per booking, 30 days)
+# and after (counts per facility, slot and date, one week):
+#   CALENDAR_BOOKINGS=30000 python verify_calendar_payload.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import transaction
+from django.db.models import Count
+from django.test import Client
+from django.utils import timezone
+from facilities.models import Booking, Facility, SlotOccupancy, TimeSlot
+from facilities.views import _calendar_week
+from users.models import User
+
+ROWS = int(os.environ.get('CALENDAR_BOOKINGS', 30000))
+DAYS = 30
+REPEAT = 20
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_payload():
+    """What calendar_view built before: every active booking for 30 days, one dict each."""
+    today = timezone.now().date()
+    bookings = Booking.objects.filter(
+        booking_date__gte=today,
+        booking_date__lte=today + timedelta(days=DAYS),
+        status='active'
+    ).values('facility_id', 'slot_id', 'booking_date')
+    return json.dumps([
+        {'facility_id': b['facility_id'], 'slot_id': b['slot_id'], 'date': b['booking_date'].strftime('%Y-%m-%d')}
+        for b in bookings
+    ])
+
+
+def windowed_payload():
+    return json.dumps(_calendar_week(None, 0))
+
+
+def load_bookings(facilities, slots, today):
+    by_session = {}
+    for slot in slots:
+        by_session.setdefault(slot.session, []).append(slot)
+    sessions = sorted(by_session)
+    users_needed = -(-ROWS // (DAYS * len(sessions)))
+    users = [u.id for u in User.objects.bulk_create([
+        User(username=f'calendar-{i}', email=f'calendar-{i}@example.com', phone_number=f'cal{i:09d}',
+             full_name=f'Calendar {i}', address='-', status='approved')
+        for i in range(users_needed)
+    ])]
+    if not users[0]:
+        users = list(User.objects.filter(username__startswith='calendar-').order_by('id').values_list('id', flat=True))
+
+    batch = []
+    for i in range(ROWS):
+        # One active booking per user, date and session, as the constraint requires
+        combo = i // len(users)
+        session = sessions[combo % len(sessions)]
+        slot = by_session[session][i % len(by_session[session])]
+        batch.append(Booking(
+            user_id=users[i % len(users)], facility_id=facilities[i % len(facilities)], slot_id=slot.id,
+            booking_date=today + timedelta(days=combo // len(sessions)), session=session, status='active',
+        ))
+    Booking.objects.bulk_create(batch, batch_size=5000)
+
+    # Counters for the window, as the reservation engine would have kept them
+    window = dict(booking_date__gte=today, booking_date__lte=today + timedelta(days=DAYS))
+    SlotOccupancy.objects.filter(**window).delete()
+    SlotOccupancy.objects.bulk_create([
+        SlotOccupancy(facility_id=row['facility_id'], slot_id=row['slot_id'],
+                      booking_date=row['booking_date'], active_count=row['total'])
+        for row in Booking.objects.filter(status='active', **window)
+        .values('facility_id', 'slot_id', 'booking_date').annotate(total=Count('id'))
+    ], batch_size=5000)
+
+
+def timed(build):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        body = build()
+    return (time.perf_counter() - start) * 1000 / REPEAT, len(body.encode() if isinstance(body, str) else body)
+
+
+def verify_calendar_payload():
+    print(f"Verifying calendar payload with {ROWS} active bookings over {DAYS} days...")
+    facilities = list(Facility.objects.filter(is_active=True).values_list('id', flat=True))
+    slots = list(TimeSlot.objects.order_by('start_time'))
+    if not (facilities and slots):
+        print("FAIL: Need at least one active facility and time slot.")
+        return
+    today = timezone.now().date()
+    try:
+        with transaction.atomic():
+            load_bookings(facilities, slots, today)
+            user = User.objects.filter(username__startswith='calendar-').first()
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+
+            rows = {
+                'payload (legacy, 30 days)': timed(legacy_payload),
+                'payload (windowed, 1 week)': timed(windowed_payload),
+                'calendar page': timed(lambda: client.get('/facilities/calendar/').content),
+                'week.json (next week)': timed(lambda: client.get('/facilities/calendar/week.json?week=1').content),
+            }
+            print(f"{'(mean of ' + str(REPEAT) + ')':32} {'ms':>10} {'bytes':>12}")
+            for name, (ms, size) in rows.items():
+                print(f"{name:32} {ms:10.2f} {size:12,}")
+
+            week = _calendar_week(None, 0)
+            expected = Booking.objects.filter(
+                status='active', booking_date__gte=week['start'], booking_date__lte=week['end'],
+                facility__is_active=True,
+            ).count()
+            counted = sum(n for by_facility in week['counts'].values() for by_slot in by_facility.values() for n in by_slot.values())
+            if counted == expected:
+                print(f"PASS: Week counts add up to the {expected} bookings in the window.")
+            else:
+                print(f"FAIL: Week counts total {counted}, expected {expected}.")
+            if rows['payload (windowed, 1 week)'][1] < rows['payload (legacy, 30 days)'][1]:
+                print("PASS: Windowed payload is smaller than the per-booking dump.")
+            else:
+                print("FAIL: Windowed payload is not smaller.")
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    verify_calendar_payload()
@@ -2,6 +2,7 @@ import os
 import django
 from django.utils import timezone
 from datetime import timedelta
+from django.db import transaction
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
 django.setup()
@@ -78,14 +79,13 @@ def verify_capacity():
         
     # 4. Single User Shift Limit Check
     print("\n[Test] Checking Single User Booking limit...")
-    # User 0 already has booking. Try booking SAME slot again -> Should fail by unique constraint? No we removed it.
-    # But Views have check: "You already have an active booking for this slot." (Wait, is that check still there?)
-    # Lines 74-76 in Booking.clean()
+    # User 0 already has booking. The booking_one_active_per_session constraint
+    # (and the unique_together on user/facility/slot/date) must reject a second one.
     
     try:
-        b = Booking(user=users[0], facility=badminton, slot=slot, booking_date=target_date, status='active')
-        b.clean()
-        print("FAIL: User 0 was able to book same slot twice (Model clean() failed to block).")
+        with transaction.atomic():
+            Booking.objects.create(user=users[0], facility=badminton, slot=slot, booking_date=target_date, status='active')
+        print("FAIL: User 0 was able to book same slot twice (database constraint failed to block).")
     except Exception as e:
         print(f"PASS: User 0 blocked from double booking: {e}")
 
@@ -0,0 +1,96 @@
+import os
+import django
+import threading
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import connection
+from django.utils import timezone
+from users.models import User
+from facilities.models import Facility, TimeSlot, Booking, SlotOccupancy
+from facilities.reservations import deactivate_booking, reserve_slot, seat_released
+
+CONCURRENCY = int(os.environ.get('CANCEL_CONCURRENCY', 10))
+
+def counts(facility, slot, target_date):
+    active = Booking.objects.filter(facility=facility, slot=slot, booking_date=target_date, status='active').count()
+    counter = SlotOccupancy.objects.get(facility=facility, slot=slot, booking_date=target_date).active_count
+    return active, counter
+
+def verify_double_cancel():
+    print(f"Verifying that cancelling a booking twice releases one seat ({connection.vendor})...")
+
+    facility, _ = Facility.objects.update_or_create(
+        facility_name='Double Cancel Court',
+        defaults={'max_duration': 45, 'capacity_per_slot': 2}
+    )
+    slot = TimeSlot.objects.order_by('start_time').first()
+    if not slot:
+        print("FAIL: No time slots. Run `manage.py generate_slots` first.")
+        return
+    target_date = timezone.now().date() + timedelta(days=3)
+
+    # Clean previous runs
+    Booking.objects.filter(facility=facility).delete()
+    SlotOccupancy.objects.filter(facility=facility).delete()
+    User.objects.filter(username__startswith='double_cancel_').delete()
+    users = [
+        User.objects.create(username=f"double_cancel_{i}", email=f"double_cancel_{i}@test.com",
+                            phone_number=f"7{i:09d}", status='approved')
+        for i in range(3)
+    ]
+
+    released = []
+    receiver = lambda **kwargs: released.append(kwargs['seats'])
+    seat_released.connect(receiver)
+    try:
+        # 1. Two stale copies of the same active booking, cancelled one after the other
+        booking = reserve_slot(users[0], facility, slot, target_date, validated=True)
+        reserve_slot(users[1], facility, slot, target_date, validated=True)
+        first, second = Booking.objects.get(pk=booking.pk), Booking.objects.get(pk=booking.pk)
+        deactivate_booking(first)
+        deactivate_booking(second)
+        active, counter = counts(facility, slot, target_date)
+        if active == counter == 1 and released == [1] and second.status == 'cancelled':
+            print("PASS: Stale copies release the seat once.")
+        else:
+            print(f"FAIL: {active} active bookings, counter {counter}, seats released {released}.")
+
+        # 2. The same booking cancelled by several requests at once
+        booking = reserve_slot(users[2], facility, slot, target_date, validated=True)
+        released.clear()
+        barrier = threading.Barrier(CONCURRENCY)
+
+        def cancel():
+            try:
+                copy = Booking.objects.get(pk=booking.pk)
+                barrier.wait()
+                deactivate_booking(copy)
+            except Exception:
+                # e.g. "database is locked" on SQLite; that request simply fails
+                pass
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=cancel) for _ in range(CONCURRENCY)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        active, counter = counts(facility, slot, target_date)
+        if active == counter == 1 and released == [1]:
+            print(f"PASS: {CONCURRENCY} concurrent cancels release the seat once.")
+        else:
+            print(f"FAIL: {active} active bookings, counter {counter}, seats released {released}.")
+    finally:
+        seat_released.disconnect(receiver)
+        # Cleanup
+        Booking.objects.filter(facility=facility).delete()
+        SlotOccupancy.objects.filter(facility=facility).delete()
+        User.objects.filter(username__startswith='double_cancel_').delete()
+        facility.delete()
+
+if __name__ == '__main__':
+    verify_double_cancel()
@@ -0,0 +1,71 @@
+import os
+import re
+import django
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from users.models import User
+from facilities.models import Facility, TimeSlot, Booking, FacilityClosure, SlotOccupancy
+
+def booking_rule_queries(user, facility, slot, day):
+    """The hot-path queries behind booking rules, availability and the calendar."""
+    week_end = day + timedelta(days=6)
+    return {
+        'user active bookings (rules)': Booking.objects.filter(user=user, booking_date__gte=day, status='active'),
+        'user future dates': Booking.objects.filter(user=user, booking_date__gt=day, status='active').values_list('booking_date', flat=True).distinct(),
+        'slot capacity recount': Booking.objects.filter(facility=facility, slot=slot, booking_date=day, status='active'),
+        'active bookings by date': Booking.objects.filter(booking_date__gte=day, status='active'),
+        'closure lookup': FacilityClosure.objects.filter(date=day).filter(Q(facility=facility) | Q(facility__isnull=True)),
+        'occupancy row': SlotOccupancy.objects.filter(facility=facility, slot=slot, booking_date=day),
+        'facility availability window': SlotOccupancy.objects.filter(facility=facility, booking_date__gte=day, booking_date__lte=week_end),
+        'calendar week': SlotOccupancy.objects.filter(booking_date__gte=day, booking_date__lte=week_end),
+    }
+
+def full_scans(plan):
+    """Tables read without an index, according to the EXPLAIN output."""
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    # SQLite: "SCAN table" without "USING ... INDEX" is a full table scan
+    return [
+        m.group(1) for m in re.finditer(r'SCAN (\w+)(.*)', plan)
+        if 'INDEX' not in m.group(2)
+    ]
+
+def verify_query_plans():
+    print(f"Verifying booking query plans ({connection.vendor})...")
+
+    user = User.objects.first()
+    facility = Facility.objects.first()
+    slot = TimeSlot.objects.first()
+    if not (user and facility and slot):
+        print("FAIL: Need at least one user, facility and time slot.")
+        return
+
+    if connection.vendor == 'postgresql':
+        # Small dev tables make the planner prefer sequential scans; ask it what it would do at scale.
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+    failures = 0
+    for name, queryset in booking_rule_queries(user, facility, slot, timezone.now().date()).items():
+        plan = queryset.explain()
+        scans = full_scans(plan)
+        if scans:
+            failures += 1
+            print(f"  FAIL: {name} does a full scan of {', '.join(scans)}")
+            print("    " + plan.replace("\n", "\n    "))
+        else:
+            print(f"  PASS: {name}")
+
+    if failures:
+        print(f"FAIL: {failures} queries fall back to full scans.")
+    else:
+        print("PASS: All booking rule queries use indexes.")
+
+if __name__ == '__main__':
+    verify_query_plans()
@@ -0,0 +1,108 @@
+import os
+import django
+import threading
+import time
+from datetime import timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import connection
+from django.utils import timezone
+from users.models import User
+from facilities.models import Facility, TimeSlot, Booking, SlotOccupancy
+from facilities.reservations import reserve_slot
+
+CONCURRENCY = int(os.environ.get('RACE_CONCURRENCY', 200))
+
+def verify_race():
+    print(f"Verifying reservation engine with {CONCURRENCY} concurrent requests ({connection.vendor})...")
+
+    facility, _ = Facility.objects.update_or_create(
+        facility_name='Race Test Court',
+        defaults={'max_duration': 45, 'capacity_per_slot': 8}
+    )
+    slot = TimeSlot.objects.order_by('start_time').first()
+    if not slot:
+        print("FAIL: No time slots. Run `manage.py generate_slots` first.")
+        return
+    target_date = timezone.now().date() + timedelta(days=3)
+
+    # Clean previous runs
+    Booking.objects.filter(facility=facility).delete()
+    SlotOccupancy.objects.filter(facility=facility).delete()
+    User.objects.filter(username__startswith='race_user_').delete()
+
+    users = User.objects.bulk_create([
+        User(
+            username=f"race_user_{i}",
+            email=f"race_{i}@test.com",
+            phone_number=f"8{i:09d}",
+            status='approved'
+        )
+        for i in range(CONCURRENCY)
+    ])
+    users = list(User.objects.filter(username__startswith='race_user_'))
+
+    barrier = threading.Barrier(CONCURRENCY)
+    results = {'admitted': 0, 'full': 0, 'error': 0}
+    lock = threading.Lock()
+
+    def attempt(user):
+        outcome = 'error'
+        try:
+            barrier.wait()
+            reserve_slot(user, facility, slot, target_date)
+            outcome = 'admitted'
+        except django.core.exceptions.ValidationError:
+            outcome = 'full'
+        except Exception:
+            # e.g. "database is locked" on SQLite; the request is rejected, never overbooked
+            outcome = 'error'
+        finally:
+            connection.close()
+            with lock:
+                results[outcome] += 1
+
+    threads = [threading.Thread(target=attempt, args=(u,)) for u in users]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    active = Booking.objects.filter(facility=facility, slot=slot, booking_date=target_date, status='active').count()
+    counter = SlotOccupancy.objects.get(facility=facility, slot=slot, booking_date=target_date).active_count
+    print(f"  Admitted: {results['admitted']}, Full: {results['full']}, Errors: {results['error']}")
+    print(f"  Elapsed: {elapsed:.2f}s ({CONCURRENCY / elapsed:.0f} requests/s)")
+    print(f"  Active bookings: {active}, Counter: {counter}, Capacity: {facility.capacity_per_slot}")
+
+    expected = min(facility.capacity_per_slot, CONCURRENCY)
+    if active == counter == results['admitted'] == expected:
+        print(f"PASS: Exactly {expected} admitted, no overbooking.")
+    elif active > facility.capacity_per_slot:
+        print("FAIL: Slot overbooked.")
+    elif active != counter or active != results['admitted']:
+        print("FAIL: Counter out of sync.")
+    else:
+        print(f"FAIL: Only {results['admitted']} of {expected} seats were filled.")
+
+    # Capacity lowered behind a cached facility instance (no catalogue bump)
+    Facility.objects.filter(pk=facility.pk).update(capacity_per_slot=1)
+    Booking.objects.filter(facility=facility).delete()
+    SlotOccupancy.objects.filter(facility=facility).delete()
+    reserve_slot(users[0], facility, slot, target_date)
+    try:
+        reserve_slot(users[1], facility, slot, target_date)
+        print("FAIL: Admitted against a stale capacity_per_slot.")
+    except django.core.exceptions.ValidationError:
+        print("PASS: Admission uses the capacity stored in the database.")
+
+    # Cleanup
+    Booking.objects.filter(facility=facility).delete()
+    User.objects.filter(username__startswith='race_user_').delete()
+    facility.delete()
+
+if __name__ == '__main__':
+    verify_race()
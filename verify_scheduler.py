@@ -0,0 +1,111 @@
+import os
+from datetime import datetime, timedelta
+from io import StringIO
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from scheduler import runner
+from scheduler.cron import Cron
+from scheduler.jobs import ScheduledJob
+from scheduler.models import Job, JobRun
+
+
+class Rollback(Exception):
+    pass
+
+
+def verify_scheduler():
+    print("Verifying scheduler...")
+
+    # 1. Cron expressions
+    start = timezone.make_aware(datetime(2026, 4, 29, 23, 59, 30))
+    checks = [
+        ('30 0 * * *', datetime(2026, 4, 30, 0, 30)),
+        ('*/15 * * * *', datetime(2026, 4, 30, 0, 0)),
+        ('0 9 * * 1', datetime(2026, 5, 4, 9, 0)),      # next Monday
+        ('0 0 29 2 *', datetime(2028, 2, 29, 0, 0)),
+    ]
+    wrong = [(expr, Cron(expr).next_after(start)) for expr, expected in checks
+             if Cron(expr).next_after(start) != timezone.make_aware(expected)]
+    if not wrong:
+        print("PASS: Cron expressions give the expected next run.")
+    else:
+        print(f"FAIL: Wrong next runs: {wrong}")
+
+    calls = []
+    job = ScheduledJob('verify_job', '0 3 * * *', lambda: calls.append(1) or 'ran')
+    failing = ScheduledJob('verify_failing', '0 3 * * *', lambda: 1 / 0)
+    try:
+        with transaction.atomic():
+            runner.sync_jobs([job, failing])
+            Job.objects.filter(name__startswith='verify_').update(next_run_at=timezone.now() - timedelta(minutes=1))
+
+            # 2. Two replicas: only one claims the due run
+            now = timezone.now()
+            won = [runner.acquire(job, now, 'replica-a'), runner.acquire(job, now, 'replica-b')]
+            if won == [True, False]:
+                print("PASS: Only one replica acquires a due job.")
+            else:
+                print(f"FAIL: Lease acquired {won}.")
+
+            # 3. The run is recorded and the job moves to its next slot
+            job_run = runner.run(job, 'replica-a')
+            row = Job.objects.get(name='verify_job')
+            if (calls == [1] and job_run.status == 'success' and job_run.duration is not None
+                    and row.next_run_at == job.cron.next_after(job_run.finished_at) and not row.locked_by):
+                print(f"PASS: Run recorded ({job_run.duration}) and rescheduled for {row.next_run_at}.")
+            else:
+                print("FAIL: Run was not recorded or rescheduled.")
+
+            # 4. Not due any more: replica B gets nothing
+            if not runner.run_due([job], 'replica-b') and calls == [1]:
+                print("PASS: A finished run is not repeated by another replica.")
+            else:
+                print("FAIL: Job ran twice.")
+
+            # 5. An expired lease (dead replica) can be taken over
+            runner.mark_due('verify_job')
+            runner.acquire(job, timezone.now(), 'replica-a')
+            later = timezone.now() + job.lease + timedelta(seconds=1)
+            if runner.acquire(job, later, 'replica-b'):
+                print("PASS: Expired leases are taken over.")
+            else:
+                print("FAIL: Expired lease was not taken over.")
+
+            # 6. Failures are recorded and still release the job
+            failed = runner.run_due([failing], 'replica-a')
+            if failed and failed[0].status == 'failed' and 'ZeroDivisionError' in failed[0].output \
+                    and not Job.objects.get(name='verify_failing').locked_by:
+                print("PASS: Failed runs are recorded and released.")
+            else:
+                print("FAIL: Failed run not handled.")
+            raise Rollback
+    except Rollback:
+        pass
+
+    # 7. --run JOB runs that job only, even when others are due. The command
+    #    manages its own connections, so this runs for real (refresh_revenue
+    #    is idempotent) and the schedule is put back afterwards.
+    runner.sync_jobs()
+    schedule = dict(Job.objects.values_list('name', 'next_run_at'))
+    try:
+        Job.objects.update(next_run_at=timezone.now() - timedelta(minutes=1))
+        started = timezone.now()
+        call_command('run_scheduler', run='refresh_revenue', stdout=StringIO())
+        ran = list(JobRun.objects.filter(started_at__gte=started).values_list('job_id', flat=True))
+        if ran == ['refresh_revenue']:
+            print("PASS: --run runs only the named job.")
+        else:
+            print(f"FAIL: --run ran {ran}.")
+    finally:
+        for name, next_run_at in schedule.items():
+            Job.objects.filter(name=name).update(next_run_at=next_run_at)
+
+
+if __name__ == "__main__":
+    verify_scheduler()
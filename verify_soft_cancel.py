@@ -0,0 +1,133 @@
+import os
+import time
+from datetime import timedelta
+import django
+
+# Functional checks for soft cancellation, then a cancel-heavy workload
+# (book, cancel, rebook the same slot) with delete() vs. the status change:
+#   CANCEL_CYCLES=2000 python verify_soft_cancel.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.db import connection, transaction
+from django.test import Client, TestCase
+from django.utils import timezone
+from facilities.models import Booking, Facility, SlotOccupancy, TimeSlot
+from facilities.reservations import deactivate_booking, reserve_slot, seat_released
+from users.models import User
+
+CYCLES = int(os.environ.get('CANCEL_CYCLES', 2000))
+WRITES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class Rollback(Exception):
+    pass
+
+
+def booking_indexes(only_status=False):
+    """
+    Secondary indexes on Booking (foreign keys, Meta indexes, unique constraints).
+    A delete removes an entry from each; a status change only touches those on status.
+    """
+    indexes = list(Booking._meta.indexes) + list(Booking._meta.constraints)
+    if only_status:
+        return len([i for i in indexes if 'status' in i.fields or 'status' in str(getattr(i, 'condition', ''))])
+    foreign_keys = [f for f in Booking._meta.concrete_fields if f.db_index and not f.primary_key]
+    return len(indexes) + len(foreign_keys)
+
+
+def workload(user, facility, slot, day, cancel):
+    writes = []
+
+    def count_writes(execute, sql, params, many, context):
+        writes.append(sql.lstrip().upper().startswith(WRITES))
+        return execute(sql, params, many, context)
+
+    elapsed = 0
+    for _ in range(CYCLES):
+        booking = reserve_slot(user, facility, slot, day, validated=True)
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_writes):
+            cancel(booking)
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000 / CYCLES, sum(writes) / CYCLES
+
+
+def verify_soft_cancel():
+    print("Verifying soft cancellation...")
+    facility = Facility.objects.filter(is_active=True).first()
+    slot = TimeSlot.objects.first()
+    if not (facility and slot):
+        print("FAIL: Need an active facility and a time slot.")
+        return
+    day = timezone.now().date() + timedelta(days=1)
+    released = []
+    receiver = lambda **kwargs: released.append(kwargs['seats'])
+    seat_released.connect(receiver)
+    try:
+        with transaction.atomic():
+            user = User.objects.create(username='soft-cancel', email='soft-cancel@example.com', phone_number='sc000000001',
+                                       full_name='Soft Cancel', address='-', status='approved')
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+
+            # 1. Cancelling keeps the row and gives the seat back
+            booking = reserve_slot(user, facility, slot, day, validated=True)
+            occupied = SlotOccupancy.objects.get(facility=facility, slot=slot, booking_date=day).active_count
+            # on_commit callbacks (the seat_released hook) would otherwise wait for our rolled-back transaction
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                client.get(f'/facilities/cancel-booking/{booking.id}/')
+            booking.refresh_from_db()
+            after = SlotOccupancy.objects.get(facility=facility, slot=slot, booking_date=day).active_count
+            if booking.status == 'cancelled' and after == occupied - 1:
+                print("PASS: Cancel keeps the booking as 'cancelled' and releases its seat.")
+            else:
+                print(f"FAIL: status {booking.status}, occupancy {occupied} -> {after}.")
+            if released == [1]:
+                print("PASS: seat_released fired for the freed seat.")
+            else:
+                print(f"FAIL: seat_released sent {released}.")
+
+            # 2. The same slot can be booked again; a cancelled booking can't be cancelled twice
+            try:
+                reserve_slot(user, facility, slot, day, validated=True)
+                print("PASS: A cancelled slot can be rebooked.")
+            except Exception as e:
+                print(f"FAIL: Rebooking failed: {e}")
+            client.get(f'/facilities/cancel-booking/{booking.id}/')
+            booking.refresh_from_db()
+            if booking.status == 'cancelled' and SlotOccupancy.objects.get(facility=facility, slot=slot, booking_date=day).active_count == occupied:
+                print("PASS: Cancelling twice does not release a second seat.")
+            else:
+                print("FAIL: Second cancel changed the occupancy.")
+            Booking.objects.filter(user=user).delete()
+
+            # 3. Deleting a past booking frees its counter but offers nothing
+            past = timezone.now().date() - timedelta(days=1)
+            Booking.objects.bulk_create([Booking(user=user, facility=facility, slot=slot, booking_date=past,
+                                                 session=slot.session, status='active')])
+            released.clear()
+            with TestCase.captureOnCommitCallbacks(execute=True):
+                Booking.objects.get(user=user, booking_date=past).delete()
+            if released == []:
+                print("PASS: No seat_released for a slot that is already over.")
+            else:
+                print(f"FAIL: seat_released sent {released} for a past slot.")
+
+            # 4. Cancel-heavy workload
+            deleted = workload(user, facility, slot, day + timedelta(days=1), lambda b: b.delete())
+            soft = workload(user, facility, slot, day + timedelta(days=2), lambda b: deactivate_booking(b))
+            print(f"INFO: {CYCLES} book/cancel cycles, per cancel:")
+            print(f"  delete():    {deleted[0]:.2f} ms, {deleted[1]:.1f} write statements, "
+                  f"row + {booking_indexes()} index entries removed")
+            print(f"  soft cancel: {soft[0]:.2f} ms, {soft[1]:.1f} write statements, "
+                  f"row + {booking_indexes(only_status=True)} index entries (those on status) rewritten")
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        seat_released.disconnect(receiver)
+
+
+if __name__ == "__main__":
+    verify_soft_cancel()
@@ -0,0 +1,63 @@
+import os
+import re
+import tempfile
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.test import Client
+from django.test.utils import override_settings
+
+STATIC_URL_RE = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+
+
+def body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def verify_static_assets():
+    print("Verifying production static files (collectstatic + WhiteNoise)...")
+
+    with tempfile.TemporaryDirectory() as static_root, \
+            override_settings(DEBUG=False, STATIC_ROOT=static_root, ALLOWED_HOSTS=['*']):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        client = Client()
+
+        page = client.get('/', HTTP_ACCEPT_ENCODING='br, gzip')
+        html_size = len(page.content)
+        assets = sorted(set(STATIC_URL_RE.findall(page.content.decode())))
+        print(f"  Home page HTML: {html_size} bytes, {len(assets)} local static assets")
+        if not assets:
+            print("FAIL: Home page does not reference any /static/ assets.")
+            return
+
+        raw_total = compressed_total = 0
+        for url in assets:
+            raw = client.get(url)
+            compressed = client.get(url, HTTP_ACCEPT_ENCODING='br, gzip')
+            raw_size, compressed_size = body_size(raw), body_size(compressed)
+            raw_total += raw_size
+            compressed_total += compressed_size
+            print(f"  {url}: {raw_size} -> {compressed_size} bytes "
+                  f"({compressed.get('Content-Encoding', 'identity')}), Cache-Control: {compressed.get('Cache-Control')}")
+
+            if not re.search(r'\.[0-9a-f]{12}\.', url):
+                print(f"FAIL: {url} is not a content-hashed name.")
+            if 'immutable' not in (compressed.get('Cache-Control') or ''):
+                print(f"FAIL: {url} is not served with a far-future immutable Cache-Control.")
+
+        print(f"  First visit: {html_size + compressed_total} bytes "
+              f"({html_size} HTML + {compressed_total} static, {raw_total} uncompressed)")
+        print(f"  Repeat visit: {html_size} bytes (static assets served from browser cache)")
+        if compressed_total < raw_total:
+            print("PASS: Static assets are served pre-compressed with hashed, immutable URLs.")
+        else:
+            print("FAIL: Static assets are not served compressed.")
+
+
+if __name__ == '__main__':
+    verify_static_assets()
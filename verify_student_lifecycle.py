@@ -0,0 +1,100 @@
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+import django
+
+# Times the lifecycle run on synthetic students (all rolled back afterwards):
+#   LIFECYCLE_USERS=100000 python verify_student_lifecycle.py
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports_management_system.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+
+USERS = int(os.environ.get('LIFECYCLE_USERS', 100000))
+# The old per-row loop is too slow to run at full size; it is timed on a sample and scaled
+LOOP_SAMPLE = 2000
+
+
+class Rollback(Exception):
+    pass
+
+
+def make_students(count, prefix):
+    today = timezone.now().date()
+    users = []
+    for i in range(count):
+        kind = i % 4
+        users.append(User(
+            username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', phone_number=f'{prefix[:3]}{i:09d}',
+            full_name=f'Student {i}', address='-', status='approved', is_student=True,
+            student_type='college' if kind == 3 else 'school',
+            # classes 1-12 for school students; college students alternate expired / current
+            current_class=None if kind == 3 else i % 12 + 1,
+            course_end_date=(today - timedelta(days=1) if i % 8 == 3 else today + timedelta(days=365)) if kind == 3 else None,
+        ))
+    User.objects.bulk_create(users, batch_size=5000)
+    return User.objects.filter(username__startswith=prefix)
+
+
+def per_row_loop(students):
+    """What the command used to do: one SELECT, then one UPDATE per student."""
+    today = timezone.now().date()
+    for student in students.filter(student_type='school'):
+        if student.current_class < 12:
+            student.current_class += 1
+        else:
+            student.is_student, student.student_type, student.current_class = False, None, None
+        student.save()
+    for student in students.filter(student_type='college', course_end_date__lt=today):
+        student.is_student, student.student_type, student.current_class = False, None, None
+        student.save()
+
+
+def verify_student_lifecycle():
+    print(f"Verifying student lifecycle on {USERS} synthetic students...")
+    try:
+        with transaction.atomic():
+            students = make_students(USERS, 'lifecycle-')
+            before = dict(students.values_list('pk', 'current_class'))
+            expected_converted = sum(1 for i in range(USERS) if (i % 4 != 3 and i % 12 + 1 >= 12) or i % 8 == 3)
+
+            # 1. Dry run changes nothing
+            out = StringIO()
+            call_command('process_student_lifecycle', force=True, dry_run=True, stdout=out)
+            if dict(students.values_list('pk', 'current_class')) == before and 'Would have' in out.getvalue():
+                print("PASS: --dry-run reports counts without writing.")
+            else:
+                print("FAIL: --dry-run modified students.")
+
+            # 2. Set-based run
+            start = time.perf_counter()
+            call_command('process_student_lifecycle', force=True, stdout=StringIO())
+            elapsed = time.perf_counter() - start
+
+            converted = students.filter(is_student=False).count()
+            wrongly_promoted = sum(
+                1 for pk, current_class in students.filter(student_type='school').values_list('pk', 'current_class')
+                if current_class != before[pk] + 1
+            )
+            if converted == expected_converted and not wrongly_promoted:
+                print(f"PASS: Promoted and converted correctly ({converted} converted); class 11 went to 12, not graduated.")
+            else:
+                print(f"FAIL: {converted} converted (expected {expected_converted}), {wrongly_promoted} promoted wrongly.")
+
+            # 3. Compare with the per-row loop
+            sample = make_students(LOOP_SAMPLE, 'loop-')
+            start = time.perf_counter()
+            per_row_loop(sample)
+            loop_elapsed = (time.perf_counter() - start) * USERS / LOOP_SAMPLE
+            print(f"INFO: Set-based run {elapsed:.2f}s; per-row loop ~{loop_elapsed:.2f}s (scaled from {LOOP_SAMPLE} students).")
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    verify_student_lifecycle()